@@ -7,12 +7,24 @@ from flask import (
     flash,
     session,
     send_from_directory,
+    jsonify,
+    Response,
 )
-from db import get_connection
+from db import get_connection, prepare_cursor, fetch_records, record_class, breaker, record_error
+from cache import StaleCache
+import shared_cache
+from seat_events import seat_hub
+import queries
+import inventory
+import profiling
+from dimensions import DimensionCache
+from cities import CityIndex
 import cx_Oracle
 from datetime import datetime
 import logging
 import os
+import time
+import hashlib
 from decimal import Decimal
 
 
@@ -21,11 +33,62 @@ app.secret_key = os.environ.get("FLASK_SECRET_KEY", "skyvoyage-secret-key")
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# İsteğe bağlı profiler (kapalıyken sadece header kontrolü)
+profiling.init_app(app)
+
+# SHARED_CACHE_PATH tanımlıysa önbellekler aynı host'taki worker'lar arasında
+# paylaşılır (memory-mapped dosya); değilse her worker kendi belleğini kullanır
+shared_backend = shared_cache.from_env()
+# Koltuk deltaları diğer worker'lara paylaşımlı sürüm damgasıyla ulaşır
+seat_hub.attach_backend(shared_backend)
+
+# Okuma yolları (arama, koltuk haritası, raporlar) için son bilinen sonuçlar
+read_cache = StaleCache(
+    ttl=float(os.environ.get("READ_CACHE_TTL", "30")),
+    backend=shared_backend,
+    namespace="read",
+)
+# Yolcu başına booking listesi; booking yazma yollarında invalidate edilir
+trips_cache = StaleCache(
+    ttl=float(os.environ.get("TRIPS_CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("TRIPS_CACHE_MAX_ENTRIES", "10000")),
+    backend=shared_backend,
+    namespace="trips",
+)
+SEAT_CACHE_TTL = float(os.environ.get("SEAT_CACHE_TTL", "5"))
+
+# Aramada "son koltuklar" uyarısı eşiği
+NEARLY_FULL_SEATS = int(os.environ.get("NEARLY_FULL_SEATS", "10"))
+
+# Airplane / Flight referans verisi (booking sorguları bu tablolara JOIN yapmaz)
+dimensions = DimensionCache(
+    refresh_interval=float(os.environ.get("DIMENSION_REFRESH_SECONDS", "60")),
+    max_flights=int(os.environ.get("DIMENSION_MAX_FLIGHTS", "50000")),
+    backend=shared_backend,
+)
+
+# Şehir otomatik tamamlama: bellek içi prefix index, referans verisinin sürüm
+# kontrolüyle birlikte arka planda yenilenir
+city_index = CityIndex(
+    dimensions,
+    popularity_ttl=float(os.environ.get("CITY_POPULARITY_TTL", "3600")),
+)
+CITY_SUGGEST_MAX = 20
+
 try:
     cx_Oracle.init_oracle_client(lib_dir=r"C:\Users\Ozi\Desktop\sql\instantclient_21_19")
 except Exception as e:
     print("Client zaten yüklü veya hata:", e)
 
+# Sayaçların Booking ile periyodik uzlaştırılması (0 = kapalı); her worker thread'i
+# başlatır, DBMS_LOCK kilidini alan tek süreç çalıştırır
+INVENTORY_RECONCILE_SECONDS = float(os.environ.get("INVENTORY_RECONCILE_SECONDS", "600"))
+if INVENTORY_RECONCILE_SECONDS > 0:
+    inventory.start_reconciler(INVENTORY_RECONCILE_SECONDS)
+
+# Şehir index'inin ilk yüklemesi (açılışı bekletmez; o sırada sabit liste kullanılır)
+city_index.start()
+
 
 # --- Static aliases for component files (keeps existing folder names) ---
 @app.route("/static/js/components/<path:filename>")
@@ -43,38 +106,15 @@ def fetch_flights(from_city=None, to_city=None, flight_date=None):
         return None, "Veritabanı bağlantısı kurulamadı"
 
     try:
-        cursor = conn.cursor()
-        sql = """
-            SELECT f.flightNo,
-                   f.departureTime,
-                   f.gateNo,
-                   a.modelNo,
-                   f.landingTime
-            FROM Flight f
-            JOIN Airplane a ON f.fregNo = a.regNo
-            WHERE 1=1
-        """
-
-        params = []
-        if flight_date:
-            sql += " AND TRUNC(f.departureTime) = TO_DATE(:flight_date, 'YYYY-MM-DD')"
-            params.append(flight_date)
-
-        # from_city / to_city filters are kept optional to avoid schema mismatch
-        # Uncomment if columns exist: f.fromCity, f.toCity
-        # if from_city:
-        #     sql += " AND LOWER(f.fromCity) = LOWER(:from_city)"
-        #     params.append(from_city)
-        # if to_city:
-        #     sql += " AND LOWER(f.toCity) = LOWER(:to_city)"
-        #     params.append(to_city)
-
-        sql += " ORDER BY f.departureTime ASC"
+        cursor = prepare_cursor(conn)
+        sql, params = queries.flight_search(from_city, to_city, flight_date)
 
         cursor.execute(sql, params)
-        flights = cursor.fetchall()
+        flights = enrich_flights(fetch_records(cursor))
+        breaker.record_success()
         return flights, None
     except cx_Oracle.Error as e:
+        record_error(e)
         logger.exception("Flight query failed")
         return None, f"Sorgu hatası: {e}"
     finally:
@@ -85,12 +125,59 @@ def fetch_flights(from_city=None, to_city=None, flight_date=None):
             pass
 
 
+FLIGHT_COLUMNS = ("FLIGHTNO", "DEPARTURETIME", "GATENO", "MODELNO", "LANDINGTIME", "SEATS_LEFT")
+BOOKING_COLUMNS = ("BOOKINGDATE", "FLIGHTNO", "DEPARTURETIME", "GATENO", "MODELNO", "SEATNO", "TICKETPRICE", "BSSN")
+TRIP_COLUMNS = BOOKING_COLUMNS[:-1] + ("FIRSTNAME", "LASTNAME", "BSSN")
+
+
+def _model_no(reg_no):
+    airplane = dimensions.airplane(reg_no)
+    return airplane.MODELNO if airplane else None
+
+
+def enrich_flights(rows):
+    """
+    Flight satırlarına Airplane.modelNo'yu bellekteki referans verisinden ekler.
+    """
+    make = record_class(FLIGHT_COLUMNS)._make
+    return [
+        make((row.FLIGHTNO, row.DEPARTURETIME, row.GATENO, _model_no(row.FREGNO), row.LANDINGTIME, row.SEATS_LEFT))
+        for row in rows
+    ]
+
+
+def enrich_bookings(rows, passenger=None):
+    """
+    Sadece Booking'den okunan satırlara kalkış saati, gate ve modelNo ekler;
+    sonuç şablonların beklediği eski JOIN'li satır düzenindedir.
+    ``passenger`` (session sözlüğü) verilirse ad/soyad da eklenir (mytrips düzeni).
+    """
+    flights = dimensions.flights([row.FNO for row in rows])
+    make = record_class(TRIP_COLUMNS if passenger else BOOKING_COLUMNS)._make
+    enriched = []
+    for row in rows:
+        flight = flights.get(row.FNO)
+        if flight:
+            flight_fields = (flight.DEPARTURETIME, flight.GATENO, _model_no(flight.FREGNO))
+        else:
+            flight_fields = (None, None, None)
+        head = (row.BOOKINGDATE, row.FNO) + flight_fields + (row.SEATNO, row.TICKETPRICE)
+        if passenger:
+            tail = (passenger.get("first_name"), passenger.get("last_name"), row.BSSN)
+        else:
+            tail = (row.BSSN,)
+        enriched.append(make(head + tail))
+    return enriched
+
+
 def format_flights(rows):
     """
     Convert DB rows into dictionaries so Jinja can render them easily.
     """
     formatted = []
     for row in rows or []:
+        # Sayaç satırı olmayan uçuşlar için None: müsaitlik bilinmiyor, satışa açık
+        seats_left = row[5] if len(row) > 5 else None
         formatted.append(
             {
                 "flight": row[0],
@@ -99,6 +186,9 @@ def format_flights(rows):
                 "gate": row[2],
                 "aircraft": row[3],
                 "price": 1500,
+                "seats_left": seats_left,
+                "sold_out": seats_left is not None and seats_left <= 0,
+                "nearly_full": seats_left is not None and 0 < seats_left <= NEARLY_FULL_SEATS,
             }
         )
     return formatted
@@ -144,21 +234,32 @@ def index():
         to_city = request.form.get("to_city")
         flight_date = request.form.get("flight_date")
 
-        flights, err = fetch_flights(from_city, to_city, flight_date)
+        flights, err, stale = read_cache.get(
+            ("flights", flight_date or None),
+            lambda: fetch_flights(from_city, to_city, flight_date),
+        )
         if err:
             flash(err, "error")
             return render_template("index.html")
+        if stale:
+            flash("Veritabanı yanıt vermiyor, son bilinen sonuçlar gösteriliyor.", "warning")
 
         formatted = format_flights(flights)
-        if not formatted:
+        available = [f for f in formatted if not f["sold_out"]]
+        # Hepsi doluysa boş sonuç döner; örnek uçuşlar satın alınabilir göründüğü için gösterilmez
+        sold_out = bool(formatted) and not available
+        if sold_out:
+            flash("Bu tarihteki tüm uçuşlar dolu.", "error")
+        elif not available:
             flash("Uçuş bulunamadı, örnek sonuçlar gösteriliyor.", "error")
-            formatted = fallback_flights()
+            available = fallback_flights()
 
-        session["search_results"] = formatted
+        session["search_results"] = available
         session["search_meta"] = {
             "from_city": from_city or "Any",
             "to_city": to_city or "Any",
             "flight_date": flight_date or "Flexible",
+            "sold_out": sold_out,
         }
         return redirect(url_for("search_result"))
 
@@ -167,7 +268,9 @@ def index():
 
 @app.route("/search_result")
 def search_result():
-    flights = session.get("search_results") or fallback_flights()
+    flights = session.get("search_results")
+    if flights is None:
+        flights = fallback_flights()
     search_meta = session.get("search_meta") or {}
     return render_template("search_result.html", flights=flights, search_meta=search_meta)
 
@@ -198,6 +301,15 @@ def select_flight():
 
 
 # --- CRUD helpers for Booking -------------------------------------------------
+def notify_seat_change(flight_no, booked=None, released=None):
+    """
+    Koltuk önbelleğini temizler ve açık koltuk haritalarına delta yayınlar.
+    """
+    read_cache.invalidate(("seats", str(flight_no)))
+    seat_hub.publish(flight_no, "released", released)
+    seat_hub.publish(flight_no, "booked", booked)
+
+
 def delete_booking(conn, flight_no, ssn, booking_date):
     """
     Silme sırasında alt tablolardaki kayıtları da temizler (Economy/Business).
@@ -209,18 +321,26 @@ def delete_booking(conn, flight_no, ssn, booking_date):
             "DELETE FROM EconomyClass WHERE EflightNo = :1 AND ESSN = :2 AND EbookingDate = :3",
             (flight_no, ssn, booking_date),
         )
+        economy = cursor.rowcount
         cursor.execute(
             "DELETE FROM BusinessClass WHERE BflightNo = :1 AND BSSN = :2 AND BbookingDate = :3",
             (flight_no, ssn, booking_date),
         )
-        # Ana kayıt
+        business = cursor.rowcount
+        inventory.release(cursor, flight_no, economy=economy, business=business)
+        # Ana kayıt (boşalan koltuğu yayınlamak için seatNo geri alınır)
+        seat_var = cursor.var(str)
         cursor.execute(
-            "DELETE FROM Booking WHERE fNo = :1 AND bSSN = :2 AND bookingDate = :3",
-            (flight_no, ssn, booking_date),
+            "DELETE FROM Booking WHERE fNo = :1 AND bSSN = :2 AND bookingDate = :3 RETURNING seatNo INTO :4",
+            (flight_no, ssn, booking_date, seat_var),
         )
         conn.commit()
+        released = seat_var.getvalue()
+        notify_seat_change(flight_no, released=released[0] if released else None)
+        invalidate_trips(ssn)
         return None
     except cx_Oracle.Error as e:
+        record_error(e)
         conn.rollback()
         return str(e)
     finally:
@@ -251,12 +371,25 @@ def update_booking(conn, flight_no, ssn, booking_date, seat_no=None, ticket_pric
         if not fields:
             return None  # Güncellenecek alan yok
 
+        old_seat = None
+        if seat_no:
+            cursor.execute(
+                "SELECT seatNo FROM Booking WHERE fNo = :1 AND bSSN = :2 AND bookingDate = :3",
+                (flight_no, ssn, booking_date),
+            )
+            row = cursor.fetchone()
+            old_seat = row[0] if row else None
+
         sql = "UPDATE Booking SET " + ", ".join(fields) + " WHERE fNo = :fNo AND bSSN = :bSSN AND bookingDate = :bDate"
         params.extend([flight_no, ssn, booking_date])
         cursor.execute(sql, params)
         conn.commit()
+        if seat_no and seat_no != old_seat:
+            notify_seat_change(flight_no, booked=seat_no, released=old_seat)
+        invalidate_trips(ssn)
         return None
     except cx_Oracle.Error as e:
+        record_error(e)
         conn.rollback()
         return str(e)
     finally:
@@ -265,6 +398,162 @@ def update_booking(conn, flight_no, ssn, booking_date, seat_no=None, ticket_pric
         except Exception:
             pass
 
+# --- Batch helpers for Booking -------------------------------------------------
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", "500"))
+
+
+def parse_booking_keys(values):
+    """
+    Checkbox değerlerini ("flightNo|ssn|ISO tarih") booking anahtarlarına çevirir.
+    """
+    keys = []
+    for value in values:
+        flight_no, ssn, booking_date = value.split("|", 2)
+        keys.append((flight_no, ssn, datetime.fromisoformat(booking_date)))
+    return keys
+
+
+def find_booking_keys(conn, flight_no=None, flight_date=None, gate=None):
+    """
+    Uçuş / kalkış günü / gate filtresine uyan booking anahtarlarını döndürür.
+    En az bir filtre zorunludur (yanlışlıkla tüm tabloyu seçmemek için).
+    """
+    sql = """
+        SELECT b.fNo, b.bSSN, b.bookingDate
+        FROM Booking b
+        JOIN Flight f ON b.fNo = f.flightNo
+        WHERE 1=1
+    """
+    params = {}
+    if flight_no:
+        sql += " AND b.fNo = :flight_no"
+        params["flight_no"] = flight_no
+    if flight_date:
+        # TRUNC yerine aralık: departureTime üzerindeki index kullanılabilsin
+        sql += " AND f.departureTime >= TO_DATE(:flight_date, 'YYYY-MM-DD')"
+        sql += " AND f.departureTime < TO_DATE(:flight_date, 'YYYY-MM-DD') + 1"
+        params["flight_date"] = flight_date
+    if gate:
+        sql += " AND f.gateNo = :gate"
+        params["gate"] = gate
+    if not params:
+        raise ValueError("En az bir filtre (flight_no, tarih, gate) gerekli.")
+
+    cur = prepare_cursor(conn)
+    try:
+        cur.execute(sql, params)
+        return [tuple(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _notify_bulk(keys, seats=True):
+    """
+    Toplu işlemden etkilenen yolcuların trips önbelleğini, ``seats`` ise
+    uçuşların koltuk haritalarını da yeniler.
+    """
+    if seats:
+        for flight_no in {str(key[0]) for key in keys}:
+            read_cache.invalidate(("seats", flight_no))
+            seat_hub.resync(flight_no)
+    for ssn in {str(key[1]) for key in keys}:
+        invalidate_trips(ssn)
+
+
+def bulk_delete_bookings(conn, keys, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Array DML ile toplu silme; her parça (chunk) kendi transaction'ında çalışır.
+    Parça başına özet listesi döndürür: {"batch", "requested", "affected", "error"}.
+    """
+    summary = []
+    cursor = conn.cursor()
+    try:
+        for number, chunk in enumerate(_chunks(keys, chunk_size), start=1):
+            try:
+                cursor.executemany(
+                    "DELETE FROM EconomyClass WHERE EflightNo = :1 AND ESSN = :2 AND EbookingDate = :3",
+                    chunk,
+                    arraydmlrowcounts=True,
+                )
+                economy = cursor.getarraydmlrowcounts()
+                cursor.executemany(
+                    "DELETE FROM BusinessClass WHERE BflightNo = :1 AND BSSN = :2 AND BbookingDate = :3",
+                    chunk,
+                    arraydmlrowcounts=True,
+                )
+                business = cursor.getarraydmlrowcounts()
+                released = {}
+                for key, eco, bus in zip(chunk, economy, business):
+                    counts = released.get(key[0], (0, 0))
+                    released[key[0]] = (counts[0] + eco, counts[1] + bus)
+                inventory.release_many(cursor, released)
+                cursor.executemany(
+                    "DELETE FROM Booking WHERE fNo = :1 AND bSSN = :2 AND bookingDate = :3",
+                    chunk,
+                )
+                affected = cursor.rowcount
+                conn.commit()
+                summary.append({"batch": number, "requested": len(chunk), "affected": affected, "error": None})
+            except cx_Oracle.Error as e:
+                record_error(e)
+                conn.rollback()
+                summary.append({"batch": number, "requested": len(chunk), "affected": 0, "error": str(e)})
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    _notify_bulk(keys)
+    return summary
+
+
+def bulk_update_bookings(conn, keys, seat_no=None, ticket_price=None, baggage_count=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    ``update_booking``'in toplu versiyonu: aynı alan değerleri tüm anahtarlara array DML ile uygulanır.
+    """
+    fields = {}
+    if seat_no:
+        fields["seatNo"] = seat_no
+    if ticket_price is not None:
+        fields["ticketPrice"] = ticket_price
+    if baggage_count is not None:
+        fields["baggageCount"] = baggage_count
+    if not fields:
+        return []
+
+    sql = (
+        "UPDATE Booking SET " + ", ".join(f"{name} = :{name}" for name in fields)
+        + " WHERE fNo = :fNo AND bSSN = :bSSN AND bookingDate = :bDate"
+    )
+    summary = []
+    cursor = conn.cursor()
+    try:
+        for number, chunk in enumerate(_chunks(keys, chunk_size), start=1):
+            rows = [dict(fields, fNo=fno, bSSN=ssn, bDate=bdate) for fno, ssn, bdate in chunk]
+            try:
+                cursor.executemany(sql, rows)
+                affected = cursor.rowcount
+                conn.commit()
+                summary.append({"batch": number, "requested": len(chunk), "affected": affected, "error": None})
+            except cx_Oracle.Error as e:
+                record_error(e)
+                conn.rollback()
+                summary.append({"batch": number, "requested": len(chunk), "affected": 0, "error": str(e)})
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    # Fiyat/bagaj değişikliği de trips listesinde görünür; koltuk haritası sadece seatNo'da
+    _notify_bulk(keys, seats=bool(seat_no))
+    return summary
+
+
 # 2. YOLCU BİLGİLERİ GİRİŞİ (GÜNCELLENDİ)
 @app.route("/passenger_info", methods=["GET", "POST"])
 def passenger_info():
@@ -297,19 +586,12 @@ def seat_selection():
 
     flight_id = session.get("selected_flight")
     
-    # DB'den rezerve koltukları çek
-    reserved_seats = []
-    conn = get_connection()
-    if conn:
-        try:
-            cursor = conn.cursor()
-            sql = "SELECT seatNo FROM Booking WHERE fNo = :1 AND seatNo IS NOT NULL"
-            cursor.execute(sql, (flight_id,))
-            reserved_seats = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
+    # DB'den rezerve koltukları çek (DB yavaşsa son bilinen harita)
+    reserved_seats, err, stale = cached_reserved_seats(flight_id)
+    if err:
+        reserved_seats = []
+    elif stale:
+        flash("Koltuk durumu güncel olmayabilir.", "warning")
 
     if request.method == "POST":
         # Formdan gelen koltuk ve sınıf bilgisini al
@@ -322,7 +604,85 @@ def seat_selection():
         else:
             flash("Lütfen bir koltuk seçin.", "error")
             
-    return render_template("seat.html", reserved_seats=reserved_seats)
+    return render_template("seat.html", reserved_seats=reserved_seats, flight_no=flight_id)
+
+def fetch_reserved_seats(flight_id):
+    """
+    Uçuştaki dolu koltuk numaralarını döndürür.
+    """
+    conn = get_connection()
+    if not conn:
+        return None, "Veritabanı bağlantısı kurulamadı"
+    try:
+        cursor = prepare_cursor(conn, arraysize=200, prefetchrows=201)
+        cursor.execute(queries.RESERVED_SEATS_SQL, (flight_id,))
+        seats = [row[0] for row in cursor.fetchall()]
+        breaker.record_success()
+        return seats, None
+    except cx_Oracle.Error as e:
+        record_error(e)
+        return None, f"Sorgu hatası: {e}"
+    finally:
+        try:
+            cursor.close()
+            conn.close()
+        except Exception:
+            pass
+
+
+def cached_reserved_seats(flight_id):
+    flight_id = str(flight_id)
+    return read_cache.get(
+        ("seats", flight_id), lambda: fetch_reserved_seats(flight_id), ttl=SEAT_CACHE_TTL
+    )
+
+
+# --- Seat availability API (JSON + SSE) ----------------------------------------
+@app.route("/api/flights/<flight_no>/seats")
+def seat_availability(flight_no):
+    """
+    Uçuşun dolu koltuklarını döndürür. ETag ile koşullu GET desteklenir
+    (değişiklik yoksa 304, gövde yok).
+    """
+    seats, err, stale = cached_reserved_seats(flight_no)
+    if err:
+        return jsonify({"flight": flight_no, "error": err}), 503
+
+    reserved = sorted(seats)
+    resp = jsonify({"flight": flight_no, "reserved": reserved, "stale": stale})
+    resp.set_etag(hashlib.sha1(",".join(reserved).encode("utf-8")).hexdigest())
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+
+@app.route("/api/flights/<flight_no>/seats/stream")
+def seat_availability_stream(flight_no):
+    """
+    Server-Sent Events: booked/released koltuk deltaları. Worker başına stream
+    sınırı doluysa 503 döner; istemci JSON endpoint'ini polling ile izler.
+    """
+    if not seat_hub.has_capacity():
+        return Response(status=503, headers={"Retry-After": "30"})
+    return Response(
+        seat_hub.stream(flight_no),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# --- Şehir otomatik tamamlama -------------------------------------------------
+@app.route("/api/cities")
+def city_suggestions():
+    """
+    ``q`` ile başlayan şehirler (büyük/küçük harf ve Türkçe aksan duyarsız),
+    en çok booking alan önce. DB'ye gitmez.
+    """
+    query = request.args.get("q", "")
+    limit = min(max(request.args.get("limit", 8, type=int), 1), CITY_SUGGEST_MAX)
+    resp = jsonify({"query": query, "cities": city_index.search(query, limit)})
+    resp.headers["Cache-Control"] = "public, max-age=60"
+    return resp
+
 
 # 3. REZERVASYON ONAY (GÜNCELLENDİ)
 @app.route("/confirm_booking", methods=["GET", "POST"])
@@ -346,6 +706,14 @@ def confirm_booking():
 
         cursor = conn.cursor()
         try:
+            # 0) Kapasite kontrolü: tek satırlık sayaç UPDATE'i, dolu uçuşta en ucuz red
+            class_type = session.get("class_type", "Economy")
+            business = 1 if class_type == "Business" else 0
+            if not inventory.reserve(cursor, flight_id, economy=1 - business, business=business):
+                conn.rollback()
+                flash("Üzgünüz, bu uçuşta boş koltuk kalmadı.", "error")
+                return redirect(url_for("search_result"))
+
             # A) Yolcu Ekleme (Aynı kalıyor)
             check_user = "SELECT SSN FROM Passenger WHERE SSN = :1"
             cursor.execute(check_user, (passenger["ssn"],))
@@ -389,7 +757,6 @@ def confirm_booking():
             )
 
             # Sınıf tipine göre EconomyClass veya BusinessClass'a ekle
-            class_type = session.get("class_type", "Economy")
             if class_type == "Business":
                 ins_business = "INSERT INTO BusinessClass (BflightNo, BSSN, BbookingDate) VALUES (:1, :2, :3)"
                 cursor.execute(ins_business, (flight_id, passenger["ssn"], booking_date))
@@ -398,6 +765,8 @@ def confirm_booking():
                 cursor.execute(ins_eco, (flight_id, passenger["ssn"], booking_date))
 
             conn.commit()
+            notify_seat_change(flight_id, booked=selected_seat)
+            invalidate_trips(passenger["ssn"])
             
             pnr_code = f"PNR{flight_id}{passenger['ssn'][-4:]}"
             return render_template(
@@ -409,6 +778,7 @@ def confirm_booking():
             )
 
         except cx_Oracle.Error as e:
+            record_error(e)
             conn.rollback()
             flash(f"Hata oluştu: {e}", "error")
             return redirect(url_for("index"))
@@ -421,42 +791,79 @@ def confirm_booking():
 
     # GET isteği için sayfayı render et
     return render_template("booking.html", passenger=passenger, flight=flight_data, seat=selected_seat or "TBD")
-# 4. BİLETLERİM (Login gerektirmiyor, tüm booking'leri gösterir)
+# 4. BİLETLERİM (giriş yapan yolcunun booking'leri)
 @app.route("/mytrips")
 def mytrips():
-    conn = get_connection()
-    if not conn:
-        flash("Veritabanı bağlantısı kurulamadı!", "error")
-        return render_template("mytrips.html", trips=[])
-
-    cursor = conn.cursor()
-    sql = """
-        SELECT b.bookingDate,
-               f.flightNo,
-               f.departureTime,
-               f.gateNo,
-               a.modelNo,
-               b.seatNo,
-               b.ticketPrice,
-               p.firstName,
-               p.lastName,
-               b.bSSN
-        FROM Booking b
-        JOIN Flight f ON b.fNo = f.flightNo
-        JOIN Airplane a ON f.fregNo = a.regNo
-        JOIN Passenger p ON b.bSSN = p.SSN
-        ORDER BY b.bookingDate DESC
     """
-    cursor.execute(sql)
-    trips = cursor.fetchall()
+    Giriş yapan yolcunun (session["account"]) booking'leri; yaklaşan ve geçmiş
+    uçuşlar ayrı listelenir. Tüm booking'ler için yönetim ekranı: /manage_bookings.
+    """
+    # session["passenger"] booking formundan da (doğrulanmadan) yazılır; sadece
+    # /login'in yazdığı session["account"] yetki verir
+    passenger = session.get("account")
+    if not passenger or not passenger.get("ssn"):
+        flash("Biletlerinizi görmek için giriş yapın.", "error")
+        return redirect(url_for("login"))
+
+    ssn = str(passenger["ssn"])
+    rows, err, stale = trips_cache.get(
+        ssn,
+        lambda: fetch_passenger_trips(ssn),
+        min_loaded_at=session.get("trips_written_at"),
+    )
+    if err:
+        flash(err, "error")
+        rows = []
+    elif stale:
+        flash("Veritabanı yanıt vermiyor, son bilinen biletler gösteriliyor.", "warning")
+
+    trips = enrich_bookings(rows, passenger=passenger)
+    now = datetime.now()
+    upcoming = [t for t in trips if not t.DEPARTURETIME or t.DEPARTURETIME >= now]
+    past = [t for t in trips if t.DEPARTURETIME and t.DEPARTURETIME < now]
+    # Sorgu bookingDate DESC sıralı; yaklaşanlar en yakın kalkış önce
+    upcoming.sort(key=lambda t: t.DEPARTURETIME or datetime.max)
+
+    return render_template(
+        "mytrips.html",
+        upcoming=upcoming,
+        past=past,
+        last_booking=trips[0].BOOKINGDATE if trips else None,
+    )
+
+
+def invalidate_trips(ssn):
+    """
+    Yolcunun trips önbelleğini siler. Paylaşımlı önbellek yoksa diğer worker'lar
+    bunu görmez; session'daki yazma zamanı, bu oturumun mytrips isteklerinde
+    hangi worker'a düşerse düşsün o andan eski kayıtları ıska saydırır.
+    """
+    trips_cache.invalidate(str(ssn))
+    session["trips_written_at"] = time.time()
 
-    try:
-        cursor.close()
-        conn.close()
-    except Exception:
-        pass
 
-    return render_template("mytrips.html", trips=trips)
+def fetch_passenger_trips(ssn):
+    """
+    Tek yolcunun booking satırları; Booking(bSSN, bookingDate) index'i ile okunur.
+    """
+    conn = get_connection()
+    if not conn:
+        return None, "Veritabanı bağlantısı kurulamadı!"
+    try:
+        cur = prepare_cursor(conn, arraysize=100, prefetchrows=101)
+        cur.execute(queries.PASSENGER_TRIPS_SQL, {"ssn": ssn})
+        rows = fetch_records(cur)
+        breaker.record_success()
+        return rows, None
+    except cx_Oracle.Error as e:
+        record_error(e)
+        return None, f"Sorgu hatası: {e}"
+    finally:
+        try:
+            cur.close()
+            conn.close()
+        except Exception:
+            pass
 
 
 # 5. Booking Delete (Login gerektirmiyor)
@@ -539,8 +946,9 @@ def booking_update():
 def manage_bookings():
     """
     Login gerekmeden tüm Booking kayıtlarını listeleyen basit yönetim ekranı.
-    Insert / Update / Delete yapılabilir.
+    Insert / Update / Delete ve toplu (batch) işlemler yapılabilir.
     """
+    batch_summary = None
     if request.method == "POST":
         action = request.form.get("action")
         conn = get_connection()
@@ -561,6 +969,9 @@ def manage_bookings():
                 baggage = int(baggage_raw) if baggage_raw else None
                 if not (fno and ssn):
                     flash("flight_no ve ssn zorunlu.", "error")
+                elif not inventory.reserve(cursor, fno, economy=1):
+                    conn.rollback()
+                    flash("Uçuş dolu, booking eklenemedi.", "error")
                 else:
                     cursor.execute(
                         """
@@ -574,6 +985,8 @@ def manage_bookings():
                         (fno, ssn, booking_date),
                     )
                     conn.commit()
+                    notify_seat_change(fno, booked=seat_no)
+                    invalidate_trips(ssn)
                     flash("Booking eklendi.", "success")
             elif action == "update":
                 fno = request.form.get("flight_no")
@@ -599,6 +1012,8 @@ def manage_bookings():
                         flash(f"Güncelleme hatası: {err}", "error")
                     else:
                         flash("Booking güncellendi.", "success")
+            elif action == "batch":
+                batch_summary = run_batch_action(conn, request.form)
             elif action == "delete":
                 fno = request.form.get("flight_no")
                 ssn = request.form.get("ssn")
@@ -627,7 +1042,54 @@ def manage_bookings():
     if err:
         flash(err, "error")
         bookings = []
-    return render_template("manage_bookings.html", bookings=bookings)
+    return render_template("manage_bookings.html", bookings=bookings, batch_summary=batch_summary)
+
+
+def run_batch_action(conn, form):
+    """
+    Yönetim ekranındaki toplu işlem formunu uygular.
+    Seçili satırlar (``booking_keys``) veya uçuş/tarih/gate filtresi ile eşleşen booking'ler
+    silinir ya da güncellenir; ``dry_run`` işaretliyse sadece sayılır.
+    """
+    batch_action = form.get("batch_action")
+    keys = parse_booking_keys(form.getlist("booking_keys"))
+    if not keys:
+        keys = find_booking_keys(
+            conn,
+            flight_no=form.get("match_flight_no") or None,
+            flight_date=form.get("match_date") or None,
+            gate=form.get("match_gate") or None,
+        )
+
+    summary = {"action": batch_action, "matched": len(keys), "dry_run": bool(form.get("dry_run")), "batches": []}
+    if summary["dry_run"] or not keys:
+        flash(f"{len(keys)} booking eşleşti (dry run).", "success")
+        return summary
+
+    if batch_action == "delete":
+        summary["batches"] = bulk_delete_bookings(conn, keys)
+    elif batch_action == "update":
+        seat_no = form.get("seat_no") or None
+        price_raw = form.get("ticket_price")
+        baggage_raw = form.get("baggage_count")
+        if seat_no and len(keys) > 1:
+            flash("Koltuk numarası toplu olarak güncellenemez (tek booking seçin).", "error")
+            return summary
+        summary["batches"] = bulk_update_bookings(
+            conn,
+            keys,
+            seat_no,
+            float(price_raw) if price_raw else None,
+            int(baggage_raw) if baggage_raw else None,
+        )
+    else:
+        flash("Geçersiz toplu işlem.", "error")
+        return summary
+
+    affected = sum(b["affected"] for b in summary["batches"])
+    failed = sum(1 for b in summary["batches"] if b["error"])
+    flash(f"Toplu işlem: {affected}/{len(keys)} booking, {failed} hatalı parça.", "error" if failed else "success")
+    return summary
 
 
 # 7. Raporlar (JOIN / GROUP BY / SUBQUERY örnekleri)
@@ -642,51 +1104,31 @@ def fetch_reports():
     data = {"top_flights": [], "capacity_over_avg": [], "bags_by_gate": []}
     err = None
     try:
-        cur = conn.cursor()
+        cur = prepare_cursor(conn)
 
-        # 1) Join + GROUP BY + ORDER BY: uçuş başına yolcu sayısı
-        cur.execute(
-            """
-            SELECT f.flightNo,
-                   COUNT(*) AS pax_count,
-                   MIN(b.bookingDate) AS first_booking,
-                   MAX(b.bookingDate) AS last_booking
-            FROM Booking b
-            JOIN Flight f ON b.fNo = f.flightNo
-            GROUP BY f.flightNo
-            ORDER BY pax_count DESC, f.flightNo
-            """
-        )
-        data["top_flights"] = cur.fetchall()
+        # 1) GROUP BY + ORDER BY: uçuş başına yolcu sayısı
+        cur.execute(queries.REPORT_TOP_FLIGHTS_SQL)
+        data["top_flights"] = fetch_records(cur)
 
         # 2) Subquery: kapasitesi ortalamanın üstünde olan uçaklar/flightlar
-        cur.execute(
-            """
-            SELECT f.flightNo,
-                   a.modelNo,
-                   a.capacity
-            FROM Flight f
-            JOIN Airplane a ON f.fregNo = a.regNo
-            WHERE a.capacity > (SELECT AVG(capacity) FROM Airplane)
-            ORDER BY a.capacity DESC, f.flightNo
-            """
-        )
-        data["capacity_over_avg"] = cur.fetchall()
-
-        # 3) GROUP BY + ORDER BY: gate bazlı toplam bagaj
-        cur.execute(
-            """
-            SELECT f.gateNo,
-                   SUM(NVL(b.baggageCount,0)) AS total_bags
-            FROM Booking b
-            JOIN Flight f ON b.fNo = f.flightNo
-            GROUP BY f.gateNo
-            ORDER BY total_bags DESC NULLS LAST
-            """
-        )
-        data["bags_by_gate"] = cur.fetchall()
+        cur.execute(queries.REPORT_CAPACITY_OVER_AVG_SQL)
+        data["capacity_over_avg"] = fetch_records(cur)
+
+        # 3) GROUP BY + ORDER BY: gate bazlı toplam bagaj (uçuş -> gate bellekte)
+        cur.execute(queries.REPORT_BAGS_BY_FLIGHT_SQL)
+        per_flight = fetch_records(cur)
+        flights = dimensions.flights([row.FNO for row in per_flight])
+        bags = {}
+        for row in per_flight:
+            flight = flights.get(row.FNO)
+            gate = flight.GATENO if flight else None
+            bags[gate] = bags.get(gate, 0) + (row.TOTAL_BAGS or 0)
+        make = record_class(("GATENO", "TOTAL_BAGS"))._make
+        data["bags_by_gate"] = [make(item) for item in sorted(bags.items(), key=lambda item: item[1], reverse=True)]
+        breaker.record_success()
 
     except cx_Oracle.Error as e:
+        record_error(e)
         err = f"Rapor sorgusu hatası: {e}"
     finally:
         try:
@@ -706,26 +1148,13 @@ def fetch_all_bookings():
     if not conn:
         return [], "Veritabanı bağlantısı kurulamadı!"
     try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT b.bookingDate,
-                   f.flightNo,
-                   f.departureTime,
-                   f.gateNo,
-                   a.modelNo,
-                   b.seatNo,
-                   b.ticketPrice,
-                   b.bSSN
-            FROM Booking b
-            JOIN Flight f ON b.fNo = f.flightNo
-            JOIN Airplane a ON f.fregNo = a.regNo
-            ORDER BY b.bookingDate DESC
-            """
-        )
-        rows = cur.fetchall()
+        cur = prepare_cursor(conn)
+        cur.execute(queries.ALL_BOOKINGS_SQL)
+        rows = enrich_bookings(fetch_records(cur))
+        breaker.record_success()
         return rows, None
     except cx_Oracle.Error as e:
+        record_error(e)
         return [], f"Sorgu hatası: {e}"
     finally:
         try:
@@ -737,13 +1166,23 @@ def fetch_all_bookings():
 
 @app.route("/reports")
 def reports():
-    data, err = fetch_reports()
+    data, err, stale = read_cache.get(("reports",), fetch_reports)
     if err:
         flash(err, "error")
         data = {"top_flights": [], "capacity_over_avg": [], "bags_by_gate": []}
+    elif stale:
+        flash("Veritabanı yanıt vermiyor, son bilinen rapor gösteriliyor.", "warning")
     return render_template("reports.html", data=data)
 
 
+@app.route("/health/reference")
+def reference_status():
+    """
+    Referans verisi önbelleğinin tazelik/doluluk durumu.
+    """
+    return jsonify({**dimensions.status(), "cities": city_index.status()})
+
+
 # --- AUTHENTICATION ROUTES (LOGIN / REGISTER / LOGOUT) ---
 
 @app.route("/login", methods=["GET", "POST"])
@@ -766,7 +1205,7 @@ def login():
             
             if user:
                 # Oturum aç
-                session["passenger"] = {
+                session["account"] = session["passenger"] = {
                     "ssn": user[0],
                     "first_name": user[1],
                     "last_name": user[2],
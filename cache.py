@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# ♻️ Stale-while-revalidate önbellek (okuma yolları için)
+
+# ----------------------------------------------------------------------
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "failed")
+
+    def __init__(self, value, loaded_at):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.failed = False
+
+
+class StaleCache:
+    """
+    Okuma sorguları için son başarılı sonucu tutar.
+
+    - Kayıt tazeyse doğrudan döner.
+    - Süresi geçmişse eski kayıt hemen döner ve arka planda yenilenir.
+    - Yenileme başarısız olursa (DB yavaş/kapalı) eski kayıt ``stale=True`` ile sunulmaya devam eder.
+
+    ``loader`` repo genelindeki gibi ``(value, err)`` döndüren bir fonksiyondur.
+
+    ``backend`` (ör. ``shared_cache.MmapBackend``) verilirse kayıtlar worker'lar
+    arasında paylaşılır; anahtarlar ``namespace`` ile ayrılır. Backend'e sığmayan
+    değerler süreç içi sözlükte tutulur.
+
+    Kayıtların ``loaded_at`` damgası duvar saatidir ve yükleme *başladığında*
+    alınır: ``get(..., min_loaded_at=t)`` t anındaki bir yazmadan önce okunmuş
+    olabilecek her kaydı ıska sayar.
+    """
+
+    def __init__(self, ttl=30.0, max_entries=512, backend=None, namespace=""):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.namespace = namespace
+        # Kayıt yaşı worker'lar ve session'daki yazma damgalarıyla karşılaştırılabilmeli
+        self._clock = time.time
+        self._entries = OrderedDict()
+        self._failed = set()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, ttl=None, min_loaded_at=None):
+        """
+        ``(value, err, stale)`` döndürür. ``min_loaded_at``'ten önce yüklenmiş
+        kayıt yokmuş gibi DB'den okunur.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = self._lookup(key)
+        if entry is not None and min_loaded_at is not None and entry.loaded_at < min_loaded_at:
+            entry = None
+
+        if entry is None:
+            started = self._clock()
+            value, err = loader()
+            if err:
+                return None, err, False
+            self._store(key, value, started)
+            return value, None, False
+
+        if self._clock() - entry.loaded_at > ttl:
+            self._refresh_async(key, loader)
+        return entry.value, None, entry.failed
+
+    def invalidate(self, key=None):
+        """
+        Tek bir anahtarı (veya ``key=None`` ile tümünü) siler.
+        """
+        if self.backend is not None:
+            if key is None:
+                self.backend.clear()  # tüm worker'larda, tüm namespace'ler
+            else:
+                self.backend.delete((self.namespace, key))
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._failed.clear()
+            else:
+                self._entries.pop(key, None)
+                self._failed.discard(key)
+
+    def _lookup(self, key):
+        if self.backend is not None:
+            hit = self.backend.get((self.namespace, key))
+            if hit is not None:
+                entry = _Entry(*hit)
+                entry.failed = key in self._failed
+                return entry
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, value, loaded_at):
+        with self._lock:
+            self._failed.discard(key)
+        if self.backend is not None:
+            if self.backend.set((self.namespace, key), value, loaded_at):
+                with self._lock:
+                    self._entries.pop(key, None)
+                return
+            # Slot'a sığmadı: backend'deki eski kayıt _lookup'ta yerel kaydı gölgelemesin
+            self.backend.delete((self.namespace, key))
+        with self._lock:
+            self._entries[key] = _Entry(value, loaded_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh_async(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            started = self._clock()
+            try:
+                value, err = loader()
+            except Exception as e:  # arka plan thread'i sessizce ölmemeli
+                value, err = None, str(e)
+            try:
+                if err:
+                    logger.warning("Önbellek yenilemesi başarısız (%s): %s", key, err)
+                    with self._lock:
+                        self._failed.add(key)
+                        entry = self._entries.get(key)
+                        if entry is not None:
+                            entry.failed = True
+                else:
+                    self._store(key, value, started)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"cache-refresh-{key}", daemon=True).start()
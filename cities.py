@@ -0,0 +1,149 @@
+import bisect
+import logging
+import time
+import unicodedata
+
+import cx_Oracle
+
+import queries
+from city_names import CITIES as DEFAULT_CITIES
+from db import prepare_cursor
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# 🔎 Şehir otomatik tamamlama için bellek içi prefix index
+
+# ----------------------------------------------------------------------
+# Tuş başına DB'ye gidilmez: index sıralı bir (anahtar, şehir) dizisidir ve
+# arama bisect + kısa bir tarama ile yapılır. Yenileme DimensionCache'in sürüm
+# kontrolüne bağlıdır (aynı arka plan thread'i); istek yolu sadece hazır
+# snapshot'ı okur.
+
+# Flight'ta şehir kolonları yoksa (ör. final_sql.sql şeması) city_names'teki
+# varsayılan liste kullanılır; popülerlik sıralaması bu durumda kapalıdır
+# (tüm şehirler 0, sonuçlar alfabetik).
+# ORA-00904: invalid identifier (fromCity/toCity yok)
+ORA_INVALID_IDENTIFIER = 904
+
+# Bu uzunluğa kadar prefix'lerin sıralı sonuçları index kurulurken hesaplanır;
+# tek/iki harfte bütün listeyi taramak gerekmez
+PRECOMPUTED_PREFIX_LEN = 2
+PRECOMPUTED_TOP = 20
+
+# Noktalı/noktasız i ayrımı kullanıcı girişinde güvenilmez: hepsi "i" sayılır
+_TURKISH_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+
+def fold(text):
+    """
+    Büyük/küçük harf ve aksan duyarsız anahtar: "Şanlıurfa" -> "sanliurfa".
+    """
+    text = unicodedata.normalize("NFKD", text.translate(_TURKISH_FOLD))
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+
+
+class CityIndex:
+    """
+    Şehir adlarını katlanmış (fold) anahtarlarla sıralı tutar; çok kelimeli
+    adlar her kelimeden de bulunur. Flight şehir kolonlarından yüklendiyse sonuçlar
+    booking sayısına göre sıralanır; sabit listede sıralama alfabetiktir.
+
+    - ``dimensions`` (DimensionCache) her sürüm kontrolünde index'i çağırır;
+      Flight değiştiyse veya popülerlik ``popularity_ttl``'den eskiyse index
+      yeniden kurulur.
+    """
+
+    def __init__(self, dimensions, popularity_ttl=3600.0):
+        self.dimensions = dimensions
+        self.popularity_ttl = popularity_ttl
+        self._index = self._build({city: 0 for city in DEFAULT_CITIES})
+        self._source = "default"
+        self._version = None
+        self._built_at = 0.0
+        dimensions.add_listener(self._refresh)
+
+    # --- Okuma -------------------------------------------------------------
+    def search(self, prefix, limit=8):
+        """
+        ``prefix`` ile başlayan şehirler, en popüler önce.
+        """
+        self.dimensions.ensure_fresh(background=True)
+        key = fold(prefix.strip())
+        if not key:
+            return []
+        keys, entries, top = self._index  # tek snapshot; yenileme bütün tuple'ı değiştirir
+        if len(key) <= PRECOMPUTED_PREFIX_LEN and limit <= PRECOMPUTED_TOP:
+            return top.get(key, [])[:limit]
+        return self._scan(keys, entries, key, limit)
+
+    @staticmethod
+    def _scan(keys, entries, key, limit):
+        matches = {}
+        for i in range(bisect.bisect_left(keys, key), len(keys)):
+            if not keys[i].startswith(key):
+                break
+            rank, city = entries[i]
+            matches[city] = rank
+        ranked = sorted(matches.items(), key=lambda item: (item[1], item[0]))
+        return [city for city, _ in ranked[:limit]]
+
+    def status(self):
+        return {
+            "source": self._source,
+            # False: şemada fromCity/toCity yok, booking sayısına göre sıralama yapılmıyor
+            "ranked": self._source == "flight",
+            "cities": len({city for _, city in self._index[1]}),
+            "version": self._version,
+            "age_seconds": round(time.time() - self._built_at, 1) if self._built_at else None,
+        }
+
+    # --- Yenileme ----------------------------------------------------------
+    def start(self):
+        """
+        İlk yüklemeyi arka planda başlatır (uygulama açılışını bekletmez).
+        """
+        self.dimensions.ensure_fresh(background=True)
+        return self
+
+    @staticmethod
+    def _build(popularity):
+        rows = []
+        for city, bookings in popularity.items():
+            words = city.split()
+            for i in range(len(words)):
+                # (anahtar, (-popülerlik, şehir)): eşit popülerlikte alfabetik
+                rows.append((fold(" ".join(words[i:])), (-bookings, city)))
+        rows.sort()
+        keys, entries = [key for key, _ in rows], [entry for _, entry in rows]
+        prefixes = {key[:n] for key in keys for n in range(1, PRECOMPUTED_PREFIX_LEN + 1)}
+        top = {prefix: CityIndex._scan(keys, entries, prefix, PRECOMPUTED_TOP) for prefix in prefixes}
+        return keys, entries, top
+
+    def _refresh(self, conn, version):
+        """
+        DimensionCache listener'ı: sürüm kontrolünün bağlantısıyla çalışır,
+        hataları onun thread'inde loglanır.
+        """
+        if version == self._version and time.time() - self._built_at < self.popularity_ttl:
+            return
+
+        cur = prepare_cursor(conn, arraysize=1000, prefetchrows=1001)
+        try:
+            cur.execute(queries.CITY_POPULARITY_SQL)
+        except cx_Oracle.DatabaseError as e:
+            if getattr(e.args[0], "code", None) != ORA_INVALID_IDENTIFIER:
+                raise
+            self._version = version
+            self._built_at = time.time()
+            return  # Şemada şehir kolonu yok: sabit liste kalır
+        popularity = {city: int(bookings or 0) for city, bookings in cur.fetchall()}
+        if not popularity:
+            return
+
+        self._index = self._build(popularity)
+        self._source = "flight"
+        self._version = version
+        self._built_at = time.time()
+        logger.info("Şehir index'i yüklendi: %d şehir", len(popularity))
@@ -0,0 +1,14 @@
+# ----------------------------------------------------------------------
+
+# 🏙️ Varsayılan şehir listesi
+
+# ----------------------------------------------------------------------
+# Bağımlılığı olmayan veri modülü: cities.py bunu Flight'ta şehir kolonları
+# yokken kullanır, tools/synthetic_data.py rotaları bundan üretir.
+
+CITIES = [
+    "İstanbul", "Ankara", "İzmir", "Antalya", "Adana", "Trabzon", "Gaziantep",
+    "Kayseri", "Diyarbakır", "Erzurum", "Muğla", "Şanlıurfa", "Samsun", "Van",
+    "Çanakkale", "Eskişehir", "Konya", "Malatya", "Denizli", "Hatay",
+    "London", "Berlin", "Paris", "Amsterdam", "Frankfurt", "Dubai", "Baku",
+]
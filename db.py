@@ -1,10 +1,135 @@
 import os
+import logging
+import threading
+import time
+from collections import namedtuple, deque
+from functools import lru_cache
 import cx_Oracle
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # BURADA init_oracle_client OLMAMALI (app.py'ye taşıdık)
+
+# ----------------------------------------------------------------------
+
+# 🛡️ Circuit breaker ve zaman aşımı ayarları
+
+# ----------------------------------------------------------------------
+
+# Tek bir round-trip (execute/fetch/commit) için üst sınır, milisaniye
+CALL_TIMEOUT_MS = int(os.getenv("ORA_CALL_TIMEOUT_MS", "5000"))
+# Bağlantı kurma için üst sınır, saniye (callTimeout bağlantı kurulduktan sonra geçerli)
+CONNECT_TIMEOUT_S = int(os.getenv("ORA_CONNECT_TIMEOUT", "3"))
+
+# Geçici (altyapı kaynaklı) hatalar: timeout, kopan bağlantı, listener vb.
+# Constraint ihlali gibi kullanıcı hataları breaker'ı tetiklememeli.
+TRANSIENT_ERROR_PREFIXES = ("DPI-1067", "DPI-1080", "DPI-1010")
+TRANSIENT_ORA_CODES = {1013, 3113, 3114, 3135, 12170, 12514, 12537, 12541, 12543, 12545}
+
+
+class CircuitBreaker:
+    """
+    ``window`` saniye içinde ``failure_threshold`` geçici hata olursa açılır ve
+    ``reset_timeout`` boyunca veritabanına gitmeden hemen hata döndürür (fail fast).
+    Süre dolunca tek bir deneme isteğine izin verir (half-open); deneme bağlantısı
+    kurulursa ``get_connection`` breaker'ı kapatır, hangi çağıranın denediğinden bağımsız.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, window=30.0, reset_timeout=15.0):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self._failures = deque()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            # Deneme isteği: sonucu gelmezse reset_timeout sonra tekrar denenir
+            self._state = self.HALF_OPEN
+            self._opened_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit breaker kapandı")
+            self._state = self.CLOSED
+            self._failures.clear()
+
+    def record_trial_success(self):
+        """
+        Half-open denemesi başarılıysa kapatır; kapalıyken hata penceresine dokunmaz
+        (bağlantı kurulup sorguları timeout olan DB'de hatalar birikmeye devam eder).
+        """
+        with self._lock:
+            if self._state != self.HALF_OPEN:
+                return
+            logger.info("Circuit breaker kapandı")
+            self._state = self.CLOSED
+            self._failures.clear()
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if self._state == self.HALF_OPEN or len(self._failures) >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit breaker açıldı (%d hata)", len(self._failures))
+                self._state = self.OPEN
+                self._opened_at = now
+
+
+breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("DB_BREAKER_THRESHOLD", "5")),
+    window=float(os.getenv("DB_BREAKER_WINDOW", "30")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET", "15")),
+)
+
+
+def is_transient(error):
+    """
+    cx_Oracle hatasının timeout/bağlantı kaynaklı olup olmadığını söyler.
+    """
+    err = error.args[0] if error.args else None
+    message = str(getattr(err, "message", err) or "")
+    if message.startswith(TRANSIENT_ERROR_PREFIXES):
+        return True
+    return getattr(err, "code", None) in TRANSIENT_ORA_CODES
+
+
+def record_error(error):
+    """
+    Sorgu hatasını breaker'a bildirir; sadece geçici hatalar sayılır.
+    """
+    if is_transient(error):
+        breaker.record_failure()
+
+
+class DatabaseUnavailable(Exception):
+    """Bağlantı kurulamadığında veya breaker açıkken ``query_*`` yardımcılarının hatası."""
+
+# ----------------------------------------------------------------------
+
 # 🔌 Bağlantı Fonksiyonu
 
 # ----------------------------------------------------------------------
@@ -14,31 +139,151 @@ def get_connection():
     """
 
     Veritabanına bağlantı kurar ve bağlantı nesnesini döndürür.
+    Breaker açıksa veya bağlantı kurulamazsa None döner (çağıranlar ``if not conn`` ile kontrol eder).
 
     """
+    if not breaker.allow():
+        logger.warning("Circuit breaker açık, veritabanına gidilmiyor")
+        return None
+
     user = os.getenv("ORA_USER")
     password = os.getenv("ORA_PASSWORD")
     host = os.getenv("ORA_HOST")
     port = os.getenv("ORA_PORT")
     service = os.getenv("ORA_SERVICE")
 
-    dsn = cx_Oracle.makedsn(host, port, service_name=service)
-    conn = cx_Oracle.connect(user=user, password=password, dsn=dsn)
+    try:
+        conn = cx_Oracle.connect(user=user, password=password, dsn=_dsn(host, port, service))
+    except cx_Oracle.Error:
+        logger.exception("Veritabanı bağlantısı kurulamadı")
+        breaker.record_failure()
+        return None
+    breaker.record_trial_success()
+    conn.callTimeout = CALL_TIMEOUT_MS
+    return conn
+
+
+def _dsn(host, port, service):
+    """
+    makedsn çıktısıyla aynı tanım, ek olarak bağlantı zaman aşımlarıyla: host cevap
+    vermezse worker TCP timeout'u (dakikalar) yerine CONNECT_TIMEOUT_S sonra düşer.
+    """
+    return (
+        f"(DESCRIPTION=(CONNECT_TIMEOUT={CONNECT_TIMEOUT_S})(TRANSPORT_CONNECT_TIMEOUT={CONNECT_TIMEOUT_S})"
+        f"(RETRY_COUNT=0)(ADDRESS=(PROTOCOL=TCP)(HOST={host})(PORT={port}))"
+        f"(CONNECT_DATA=(SERVICE_NAME={service})))"
+    )
+
+
+def _require_connection():
+    conn = get_connection()
+    if conn is None:
+        raise DatabaseUnavailable("Veritabanı bağlantısı kurulamadı")
     return conn
 # ----------------------------------------------------------------------
 
+# 🧱 Satır eşleme (row mapping) ve fetch ayarları
+
+# ----------------------------------------------------------------------
+
+DEFAULT_ARRAYSIZE = 500
+DEFAULT_PREFETCHROWS = 501
+
+
+@lru_cache(maxsize=256)
+def record_class(columns):
+    """
+    Aynı kolon dizisine (statement shape) sahip sorgular için tek bir
+    namedtuple sınıfı üretir. Kayıtlar tuple olduğu için şablonlardaki
+    ``row[0]`` erişimi de ``row.FLIGHTNO`` erişimi de çalışır.
+    """
+    cls = namedtuple("Record", columns, rename=True)
+    cls._columns = columns
+    cls.__reduce__ = _reduce_record
+    return cls
+
+
+def _reduce_record(record):
+    # Üretilen sınıf modülde isimle bulunamadığı için pickle (ör. paylaşımlı
+    # önbellek) kaydı kolon dizisi + değerler olarak taşır.
+    return _rebuild_record, (record._columns, tuple(record))
+
+
+def _rebuild_record(columns, values):
+    return record_class(columns)._make(values)
+
+
+def _number_handler(cursor, name, default_type, size, precision, scale):
+    """
+    NUMBER(p, 0) kolonlarını int olarak getirir. Diğerleri sürücü varsayılanında
+    kalır: COUNT/SUM gibi ifadeler (precision=0, scale=-127) değere göre int veya
+    float, büyük tam sayılar (precision > 18) hassasiyet kaybı olmadan int döner.
+    """
+    if default_type == cx_Oracle.NUMBER and scale == 0 and 0 < precision <= 18:
+        return cursor.var(int, arraysize=cursor.arraysize)
+    return None
+
+
+def prepare_cursor(conn, arraysize=DEFAULT_ARRAYSIZE, prefetchrows=DEFAULT_PREFETCHROWS):
+    """
+    Sorgu başına arraysize/prefetchrows ve NUMBER dönüşümü ayarlanmış cursor döndürür.
+    Küçük tek satırlık sorgular için ``arraysize=1, prefetchrows=2`` verilebilir.
+    """
+    cur = conn.cursor()
+    cur.arraysize = arraysize
+    cur.prefetchrows = prefetchrows
+    cur.outputtypehandler = _number_handler
+    return cur
+
+
+def _record_type(cur):
+    return record_class(tuple(d[0].upper() for d in cur.description))
+
+
+def fetch_records(cur):
+    """
+    Çalıştırılmış bir cursor'daki tüm satırları kayıt listesi olarak döndürür.
+    """
+    make = _record_type(cur)._make
+    return [make(row) for row in cur.fetchall()]
+
+
+def iter_records(cur):
+    """
+    Satırları ``arraysize`` büyüklüğünde parçalar halinde akıtır (streaming).
+    """
+    make = _record_type(cur)._make
+    while True:
+        rows = cur.fetchmany()
+        if not rows:
+            break
+        for row in rows:
+            yield make(row)
+
+
+# ----------------------------------------------------------------------
+
 # 📄 Tüm kayıtları döndür (SELECT çoklu sonuçlar)
 
 # ----------------------------------------------------------------------
 
-def query_all(sql, params=None):
+def query_all(sql, params=None, arraysize=DEFAULT_ARRAYSIZE):
 
-    with get_connection() as conn:
-        cur = conn.cursor()
+    with _require_connection() as conn:
+        cur = prepare_cursor(conn, arraysize, arraysize + 1)
+        cur.execute(sql, params or [])
+        return fetch_records(cur)
+
+
+def query_iter(sql, params=None, arraysize=DEFAULT_ARRAYSIZE):
+    """
+    ``query_all``'ın akış (generator) versiyonu; büyük listelerde tüm sonucu
+    belleğe almadan satır satır işler.
+    """
+    with _require_connection() as conn:
+        cur = prepare_cursor(conn, arraysize, arraysize + 1)
         cur.execute(sql, params or [])
-        cols = [d[0].upper() for d in cur.description]
-        data = [dict(zip(cols, row)) for row in cur.fetchall()]
-        return data
+        yield from iter_records(cur)
 
 # ----------------------------------------------------------------------
 
@@ -47,11 +292,11 @@ def query_all(sql, params=None):
 # ----------------------------------------------------------------------
 
 def query_one(sql, params=None):
-    with get_connection() as conn:
-        cur = conn.cursor()
+    with _require_connection() as conn:
+        cur = prepare_cursor(conn, arraysize=1, prefetchrows=2)
         cur.execute(sql, params or [])
         row = cur.fetchone()
-        return row
+        return _record_type(cur)._make(row) if row else None
 # ----------------------------------------------------------------------
 
 # ✏️ Veri ekleme, silme, güncelleme (INSERT / UPDATE / DELETE)
@@ -60,7 +305,7 @@ def query_one(sql, params=None):
 
 def execute(sql, params=None):
 
-    with get_connection() as conn:
+    with _require_connection() as conn:
         cur = conn.cursor()
         cur.execute(sql, params or [])
         conn.commit()
\ No newline at end of file
@@ -0,0 +1,242 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import cx_Oracle
+
+import queries
+from db import get_connection, prepare_cursor, fetch_records, record_error
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# 📚 Airplane / Flight referans verisi için süreç içi önbellek
+
+# ----------------------------------------------------------------------
+
+# Oracle IN listesi üst sınırı
+IN_LIST_LIMIT = 1000
+
+
+class DimensionCache:
+    """
+    Küçük ve nadiren değişen Airplane ve Flight satırlarını bellekte tutar;
+    booking sorguları bu tablolara JOIN yapmak yerine satırları burada zenginleştirir.
+
+    - Airplane tamamen yüklenir; Flight en fazla ``max_flights`` satırla LRU olarak
+      tutulur, eksik uçuşlar tek bir IN sorgusuyla tamamlanır.
+    - En fazla ``refresh_interval`` saniyede bir ``DIMENSION_VERSION_SQL`` ile sürüm
+      kontrol edilir; sürüm değiştiyse yeniden yüklenir. Yenileme arka plan
+      thread'inde, lock dışında çalışır ve yeni snapshot en sonda yerleştirilir;
+      istekler eldeki veriyle devam eder. Sadece henüz veri yokken gelen istekler
+      ilk yüklemeyi bekler.
+      ``invalidate()`` değişiklik bildirimi (ör. CQN) geldiğinde bir sonraki
+      erişimde yenilemeyi zorlar.
+    - ``add_listener`` ile kaydedilen türetilmiş önbellekler (ör. şehir index'i)
+      her sürüm kontrolünde aynı thread ve bağlantıyla çağrılır; kendi yoklama
+      döngüleri olmaz.
+    - ``backend`` (paylaşımlı önbellek) verilirse Airplane listesi ve tek tek yüklenen
+      uçuşlar sürüm anahtarıyla worker'lar arasında paylaşılır; bir worker'ın yüklediği
+      satır diğerlerinde DB'ye gitmeden bulunur, sürüm değişince kendiliğinden eskir.
+    """
+
+    def __init__(self, refresh_interval=60.0, max_flights=50000, backend=None):
+        self.refresh_interval = refresh_interval
+        self.max_flights = max_flights
+        self.backend = backend
+        self._airplanes = {}
+        self._flights = OrderedDict()
+        self._version = None
+        self._loaded_at = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._listeners = []
+        # İlk yükleme denemesi bitti (başarılı veya değil); bekleyen istekler devam eder
+        self._first_attempt = threading.Event()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    # --- Okuma -------------------------------------------------------------
+    def airplane(self, reg_no):
+        self.ensure_fresh()
+        return self._airplanes.get(reg_no)
+
+    def flights(self, flight_nos):
+        """
+        ``{flightNo: Flight kaydı}`` döndürür; önbellekte olmayanları toplu yükler.
+        """
+        self.ensure_fresh()
+        found, missing = {}, []
+        with self._lock:
+            for flight_no in set(flight_nos):
+                row = self._flights.get(flight_no)
+                if row is None:
+                    missing.append(flight_no)
+                else:
+                    self._flights.move_to_end(flight_no)
+                    found[flight_no] = row
+        if missing and self.backend is not None:
+            missing = self._from_backend(missing, found)
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(missing)
+        if missing:
+            for row in self._load_flights(missing):
+                found[row.FLIGHTNO] = row
+        return found
+
+    def status(self):
+        """
+        Tazelik ve doluluk bilgisi (izleme için).
+        """
+        with self._lock:
+            return {
+                "version": self._version,
+                "age_seconds": round(time.time() - self._loaded_at, 1) if self._loaded_at else None,
+                "airplanes": len(self._airplanes),
+                "flights": len(self._flights),
+                "max_flights": self.max_flights,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    # --- Yenileme ----------------------------------------------------------
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+
+    def add_listener(self, callback):
+        """
+        ``callback(conn, version)`` her sürüm kontrolünden sonra (sürüm değişmese
+        de) yenileme thread'inde çağrılır; bağlantı callback dönene kadar açıktır.
+        """
+        self._listeners.append(callback)
+
+    def ensure_fresh(self, background=False):
+        """
+        Kontrol zamanı geldiyse sürümü yoklar. Henüz veri yoksa çağıran ilk
+        yüklemeyi bekler (gerekirse kendisi yapar); ``background=True`` beklemez.
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self.refresh_interval:
+            with self._lock:
+                start = not self._refreshing and now - self._checked_at >= self.refresh_interval
+                if start:
+                    self._checked_at = now
+                    self._refreshing = True
+            if start and self._loaded_at is None and not background:
+                self._run_refresh()  # Henüz veri yok: ilk yükleme bu istekte
+            elif start:
+                threading.Thread(target=self._run_refresh, name="dimension-refresh", daemon=True).start()
+        if self._loaded_at is None and not background:
+            self._first_attempt.wait()  # İlk yükleme arka planda sürüyorsa (ör. açılışta)
+
+    def _run_refresh(self):
+        try:
+            self._refresh()
+        except Exception as e:  # arka plan thread'i sessizce ölmemeli
+            logger.warning("Referans verisi yenilenemedi: %s", e)
+        finally:
+            self._refreshing = False
+            self._first_attempt.set()
+
+    def _refresh(self):
+        conn = get_connection()
+        if not conn:
+            return  # Eldeki (eski) veriyle devam
+        try:
+            cur = prepare_cursor(conn, arraysize=1, prefetchrows=2)
+            cur.execute(queries.DIMENSION_VERSION_SQL)
+            version = tuple(cur.fetchone())
+            if version != self._version:
+                self._load(conn, version)
+            for listener in self._listeners:
+                listener(conn, version)
+        except cx_Oracle.Error as e:
+            record_error(e)
+            logger.warning("Referans verisi yenilenemedi: %s", e)
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _load(self, conn, version):
+        cur = prepare_cursor(conn, arraysize=1000, prefetchrows=1001)
+        airplanes = self._shared(("airplanes", version))
+        if airplanes is None:
+            cur.execute(queries.AIRPLANE_DIMENSION_SQL)
+            airplanes = {row.REGNO: row for row in fetch_records(cur)}
+            if self.backend is not None:
+                self.backend.set(("dimensions", "airplanes", version), airplanes)
+        cur.execute(queries.FLIGHT_DIMENSION_SQL, {"max_rows": self.max_flights})
+        flights = OrderedDict((row.FLIGHTNO, row) for row in fetch_records(cur))
+
+        with self._lock:
+            self._airplanes = airplanes
+            self._flights = flights
+            self._version = version
+            self._loaded_at = time.time()
+        logger.info("Referans verisi yüklendi: %d uçak, %d uçuş", len(airplanes), len(flights))
+
+    def _load_flights(self, flight_nos):
+        conn = get_connection()
+        if not conn:
+            return []
+        rows = []
+        try:
+            cur = prepare_cursor(conn)
+            for start in range(0, len(flight_nos), IN_LIST_LIMIT):
+                chunk = flight_nos[start:start + IN_LIST_LIMIT]
+                binds = ", ".join(f":{i + 1}" for i in range(len(chunk)))
+                cur.execute(queries.FLIGHT_BY_NO_SQL.format(binds=binds), chunk)
+                rows.extend(fetch_records(cur))
+        except cx_Oracle.Error as e:
+            record_error(e)
+            logger.warning("Uçuş referansı yüklenemedi: %s", e)
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+        with self._lock:
+            for row in rows:
+                self._flights[row.FLIGHTNO] = row
+            while len(self._flights) > self.max_flights:
+                self._flights.popitem(last=False)
+        if self.backend is not None:
+            for row in rows:
+                self.backend.set(("dimensions", "flight", self._version, row.FLIGHTNO), row)
+        return rows
+
+    # --- Paylaşımlı önbellek -----------------------------------------------
+    def _shared(self, key):
+        if self.backend is None:
+            return None
+        hit = self.backend.get(("dimensions",) + key)
+        return hit[0] if hit else None
+
+    def _from_backend(self, flight_nos, found):
+        """
+        Paylaşımlı önbellekte bulunanları ``found``'a ve yerel LRU'ya ekler,
+        hâlâ eksik olanları döndürür.
+        """
+        still_missing = []
+        for flight_no in flight_nos:
+            row = self._shared(("flight", self._version, flight_no))
+            if row is None:
+                still_missing.append(flight_no)
+            else:
+                found[flight_no] = row
+        with self._lock:
+            for flight_no in flight_nos:
+                if flight_no in found:
+                    self._flights[flight_no] = found[flight_no]
+            while len(self._flights) > self.max_flights:
+                self._flights.popitem(last=False)
+        return still_missing
@@ -0,0 +1,16 @@
+-- Yolcu bazlı "Biletlerim" sorgusu (queries.PASSENGER_TRIPS_SQL) için:
+-- WHERE bSSN = :ssn ORDER BY bookingDate DESC tek bir index range scan ile okunur.
+CREATE INDEX booking_ssn_date_ix ON Booking (bSSN, bookingDate DESC);
+
+-- Uçuş başına koltuk sayaçları (inventory.py). Booking yazma yolları bu satırı
+-- aynı transaction içinde günceller; inventory.reconcile() Booking alt
+-- tablolarından periyodik olarak yeniden hesaplar.
+-- flightNo tipi Flight.flightNo ile aynı olmalıdır.
+CREATE TABLE FlightInventory (
+    flightNo       VARCHAR2(10) PRIMARY KEY REFERENCES Flight(flightNo),
+    capacity       NUMBER(5) NOT NULL,
+    bookedEconomy  NUMBER(5) DEFAULT 0 NOT NULL,
+    bookedBusiness NUMBER(5) DEFAULT 0 NOT NULL,
+    held           NUMBER(5) DEFAULT 0 NOT NULL,
+    reconciledAt   DATE
+);
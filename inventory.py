@@ -0,0 +1,187 @@
+import logging
+import os
+import threading
+import time
+
+import cx_Oracle
+
+import queries
+from db import get_connection, prepare_cursor, record_error
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# 🎫 Uçuş başına koltuk sayaçları (FlightInventory)
+
+# ----------------------------------------------------------------------
+# Booking yazma yolları sayaçları kendi transaction'ları içinde günceller;
+# böylece doluluk kontrolü COUNT(*) yerine tek satırlık bir PK UPDATE'tir.
+# ``held`` kolonu koltuk tutma (hold) için ayrılmıştır ve müsaitlik
+# hesabına dahildir; reconcile onu değiştirmez.
+# Kapasite kabin ayrımı olmadan toplamdır: şemada (Airplane.capacity) kabin
+# başına kapasite yok, Business da toplam kapasiteye karşı kontrol edilir.
+
+# ORA-00001: aynı uçuş için sayaç satırını eşzamanlı başka bir istek oluşturdu
+ORA_UNIQUE_VIOLATION = 1
+
+# DBMS_LOCK kullanıcı kilit numarası (0..1073741823); aynı DB'yi kullanan başka
+# bir uygulamayla çakışıyorsa INVENTORY_RECONCILE_LOCK_ID ile değiştirilir
+RECONCILE_LOCK_ID = int(os.environ.get("INVENTORY_RECONCILE_LOCK_ID", "48151623"))
+
+
+def reserve(cursor, flight_no, economy=0, business=0):
+    """
+    Sayaçları artırır; kapasite aşılacaksa hiçbir şey değiştirmeden False döner.
+    Çağıranın transaction'ı içinde çalışır (commit/rollback çağırana aittir).
+    """
+    params = {"flight_no": flight_no, "eco": economy, "bus": business}
+    cursor.execute(queries.INVENTORY_RESERVE_SQL, params)
+    if cursor.rowcount:
+        return True
+
+    cursor.execute(queries.INVENTORY_EXISTS_SQL, {"flight_no": flight_no})
+    if cursor.fetchone():
+        return False  # Satır var ama yer yok: dolu
+
+    # Uçuş için henüz sayaç yok: Booking'den hesaplayıp oluştur, tekrar dene
+    try:
+        cursor.execute(queries.INVENTORY_RECONCILE_SQL, {"flight_no": flight_no})
+    except cx_Oracle.IntegrityError as e:
+        # Sadece bu ifade geri alınır; satır artık var, UPDATE ile devam
+        if getattr(e.args[0], "code", None) != ORA_UNIQUE_VIOLATION:
+            raise
+    cursor.execute(queries.INVENTORY_RESERVE_SQL, params)
+    return cursor.rowcount > 0
+
+
+def release(cursor, flight_no, economy=0, business=0):
+    """
+    Silinen booking'ler için sayaçları azaltır (0'ın altına inmez).
+    """
+    if not (economy or business):
+        return
+    cursor.execute(
+        queries.INVENTORY_RELEASE_SQL,
+        {"flight_no": flight_no, "eco": economy, "bus": business},
+    )
+
+
+def release_many(cursor, counts):
+    """
+    ``{flight_no: (economy, business)}`` için toplu (array DML) azaltma.
+    """
+    rows = [
+        {"flight_no": flight_no, "eco": eco, "bus": bus}
+        for flight_no, (eco, bus) in counts.items()
+        if eco or bus
+    ]
+    if rows:
+        cursor.executemany(queries.INVENTORY_RELEASE_SQL, rows)
+
+
+def _reconcile_flight(cursor, flight_no):
+    """
+    Sayaç satırını kilitleyip tek uçuşu yeniden sayar. Satırı tutan bir booking
+    transaction'ı varsa önce onun commit'i beklenir; kilit tutulurken gelen
+    reserve/release'ler de bu commit'i bekler, sayım üzerine yazılmaz.
+    """
+    params = {"flight_no": flight_no}
+    cursor.execute(queries.INVENTORY_LOCK_SQL, params)
+    try:
+        cursor.execute(queries.INVENTORY_RECONCILE_SQL, params)
+    except cx_Oracle.IntegrityError as e:
+        # Satır yoktu ve bu arada reserve oluşturdu (kendi sayımıyla); sonraki turda
+        if getattr(e.args[0], "code", None) != ORA_UNIQUE_VIOLATION:
+            raise
+        return 0
+    return cursor.rowcount
+
+
+def reconcile():
+    """
+    Tüm sayaçları EconomyClass/BusinessClass sayımlarından yeniden hesaplar.
+    Her uçuş kendi kısa transaction'ında kilitlenip sayılır.
+    Hata durumunda hata mesajı, başarıda None döner.
+    """
+    conn = get_connection()
+    if not conn:
+        return "Veritabanı bağlantısı kurulamadı"
+    cursor = None
+    try:
+        cursor = prepare_cursor(conn, arraysize=1000, prefetchrows=1001)
+        cursor.execute(queries.INVENTORY_FLIGHTS_SQL)
+        flights = [row[0] for row in cursor.fetchall()]
+
+        merged = 0
+        for flight_no in flights:
+            merged += _reconcile_flight(cursor, flight_no)
+            conn.commit()
+        logger.info("FlightInventory reconcile: %d uçuş", merged)
+        return None
+    except cx_Oracle.Error as e:
+        record_error(e)
+        conn.rollback()
+        return str(e)
+    finally:
+        try:
+            if cursor is not None:
+                cursor.close()
+            conn.close()
+        except Exception:
+            pass
+
+
+def _hold_leader_lock(lock_conn):
+    """
+    Reconcile kilidini tutan bağlantıyı döndürür; kilit başka süreçteyse None.
+    Kilit bağlantının oturumuna bağlıdır: süreç ölürse veya bağlantı koparsa
+    Oracle kilidi bırakır ve başka bir worker devralır.
+    """
+    if lock_conn is not None:
+        try:
+            lock_conn.ping()
+            return lock_conn
+        except cx_Oracle.Error:
+            lock_conn = None  # Oturum gitti, kilit de gitti: yeniden dene
+
+    conn = get_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        result = cursor.var(int)
+        cursor.execute(queries.INVENTORY_LEADER_LOCK_SQL, {"result": result, "lock_id": RECONCILE_LOCK_ID})
+        if result.getvalue() in (0, 4):
+            logger.info("FlightInventory reconcile bu süreçte çalışacak (pid %d)", os.getpid())
+            return conn
+    except cx_Oracle.Error as e:
+        record_error(e)
+        logger.warning("Reconcile kilidi alınamadı (DBMS_LOCK için EXECUTE yetkisi gerekli): %s", e)
+    try:
+        conn.close()
+    except Exception:
+        pass
+    return None
+
+
+def start_reconciler(interval):
+    """
+    ``interval`` saniyede bir ``reconcile`` çalıştıran daemon thread başlatır.
+    Her worker başlatabilir ama sadece DBMS_LOCK kilidini tutan süreç reconcile
+    eder; diğerleri her turda kilidi yeniden dener. Kilidi alan süreç ilk turda
+    sayaç satırı olmayan uçuşları da oluşturur.
+    """
+    def run():
+        lock_conn = None
+        while True:
+            lock_conn = _hold_leader_lock(lock_conn)
+            if lock_conn is not None:
+                err = reconcile()
+                if err:
+                    logger.warning("FlightInventory reconcile başarısız: %s", err)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="inventory-reconciler", daemon=True)
+    thread.start()
+    return thread
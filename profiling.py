@@ -0,0 +1,211 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# 🔥 İstek bazlı örnekleyici profiler (flame graph çıktısı)
+
+# ----------------------------------------------------------------------
+# Kapalıyken istek başına maliyet tek bir header/parametre kontrolüdür.
+# Açmak için:
+#   - tek istek: ``X-Profile: <token>`` header'ı veya ``?_profile=<token>``
+#     (token = profile_token(path), PROFILE_SECRET ile imzalı, PROFILE_TOKEN_TTL
+#     saniye geçerli)
+#   - örneklem: PROFILE_SAMPLE_RATE=0.01 ve isteğe bağlı PROFILE_ROUTES=index,mytrips
+# Çıktı: PROFILE_DIR/<endpoint>/<zaman>.collapsed (flamegraph.pl / speedscope
+# ile açılabilir; endpoint başına en yeni PROFILE_MAX_FILES dosya tutulur) ve
+# PROFILE_DIR/summary-<pid>.json (worker başına route bazlı özet).
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ROUTES = {r.strip() for r in os.environ.get("PROFILE_ROUTES", "").split(",") if r.strip()}
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000.0
+PROFILE_TOKEN_TTL = int(os.environ.get("PROFILE_TOKEN_TTL", "3600"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "100"))
+SUMMARY_TOP_FRAMES = 15
+
+
+def profile_token(path, secret=None, ttl=PROFILE_TOKEN_TTL, now=None):
+    """
+    Verilen path için ``ttl`` saniye geçerli profil açma token'ı üretir
+    ("<bitiş zamanı>.<imza>").
+    """
+    expires = int((now or time.time()) + ttl)
+    return f"{expires}.{_sign(path, expires, secret)}"
+
+
+def _sign(path, expires, secret=None):
+    secret = secret or os.environ.get("PROFILE_SECRET", "")
+    message = f"{path}|{expires}".encode("utf-8")
+    return hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+
+def verify_token(token, path, secret):
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(path, int(expires), secret))
+
+
+class StackSampler:
+    """
+    Hedef thread'in çağrı yığınını ``interval`` aralıklarla örnekler ve
+    "kök;...;yaprak" biçiminde katlanmış (collapsed) yığın sayıları toplar.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class RouteSummary:
+    """
+    Route başına profil sayısı, süre ve en sık görülen yaprak fonksiyonlar.
+
+    Dosya adı yazma anındaki pid'den üretilir: ``--preload`` ile master'da
+    oluşturulan nesne fork sonrası her worker'da kendi dosyasına yazar.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.routes = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f"summary-{os.getpid()}.json")
+
+    def add(self, endpoint, elapsed_ms, stacks):
+        with self._lock:
+            if self._pid != os.getpid():  # fork'tan miras kalan sayaçlar bu worker'ın değil
+                self._pid = os.getpid()
+                self.routes = {}
+            route = self.routes.setdefault(
+                endpoint, {"profiles": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": 0, "leaves": Counter()}
+            )
+            route["profiles"] += 1
+            route["total_ms"] += elapsed_ms
+            route["max_ms"] = max(route["max_ms"], elapsed_ms)
+            for stack, count in stacks.items():
+                route["samples"] += count
+                route["leaves"][stack.rsplit(";", 1)[-1]] += count
+            self._write()
+
+    def _write(self):
+        data = {
+            endpoint: {
+                "profiles": route["profiles"],
+                "avg_ms": round(route["total_ms"] / route["profiles"], 2),
+                "max_ms": round(route["max_ms"], 2),
+                "samples": route["samples"],
+                "top_leaves": route["leaves"].most_common(SUMMARY_TOP_FRAMES),
+            }
+            for endpoint, route in self.routes.items()
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def _prune(directory, keep):
+    """
+    Klasörde en yeni ``keep`` profil dosyasını bırakır.
+    """
+    files = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".collapsed")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in files[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass  # Başka bir worker silmiş olabilir
+
+
+def _should_profile(secret):
+    token = request.headers.get("X-Profile") or request.args.get("_profile")
+    if token and secret:
+        return verify_token(token, request.path, secret)
+    if PROFILE_SAMPLE_RATE <= 0:
+        return False
+    if PROFILE_ROUTES and request.endpoint not in PROFILE_ROUTES:
+        return False
+    return random.random() < PROFILE_SAMPLE_RATE
+
+
+def init_app(app):
+    """
+    before/teardown hook'larını kaydeder. Teardown'da durdurulduğu için Jinja
+    render'ı ve session serileştirmesi de profile dahildir.
+    """
+    secret = os.environ.get("PROFILE_SECRET", "")
+    # Her worker kendi özetini yazar; aynı dosyayı birbirinin üstüne yazmazlar
+    summary = RouteSummary(PROFILE_DIR)
+
+    @app.before_request
+    def _start_profiler():
+        if not _should_profile(secret):
+            return
+        g._profiler = StackSampler(threading.get_ident()).start()
+        g._profile_started = time.perf_counter()
+
+    @app.teardown_request
+    def _stop_profiler(exc):
+        sampler = g.pop("_profiler", None)
+        if sampler is None:
+            return
+        elapsed_ms = (time.perf_counter() - g.pop("_profile_started")) * 1000
+        stacks = sampler.stop()
+        endpoint = request.endpoint or "unknown"
+        try:
+            directory = os.path.join(PROFILE_DIR, endpoint)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{int(elapsed_ms)}ms.collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            _prune(directory, PROFILE_MAX_FILES)
+            summary.add(endpoint, elapsed_ms, stacks)
+            logger.info("Profil yazıldı: %s (%.1f ms, %d örnek)", path, elapsed_ms, sum(stacks.values()))
+        except OSError as e:
+            logger.warning("Profil yazılamadı: %s", e)
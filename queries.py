@@ -0,0 +1,205 @@
+# ----------------------------------------------------------------------
+
+# 🗂️ Uygulamanın okuma sorguları
+# app.py ve tools/query_scaling.py aynı SQL metnini kullanır; böylece
+# ölçeklenme testleri uygulamanın gerçekten çalıştırdığı sorguları ölçer.
+
+# ----------------------------------------------------------------------
+
+# Booking/Flight sorguları Airplane ve Flight'a JOIN yapmaz; modelNo, gate ve
+# kalkış saati dimensions.DimensionCache'ten bellekte eklenir.
+
+# FlightInventory PK üzerinden tek satırlık LEFT JOIN: satır başına COUNT(*) yok
+FLIGHT_SEARCH_SQL = """
+    SELECT f.flightNo,
+           f.departureTime,
+           f.gateNo,
+           f.fregNo,
+           f.landingTime,
+           i.capacity - i.bookedEconomy - i.bookedBusiness - i.held AS seats_left
+    FROM Flight f
+    LEFT JOIN FlightInventory i ON i.flightNo = f.flightNo
+    WHERE 1=1
+"""
+
+
+def flight_search(from_city=None, to_city=None, flight_date=None):
+    """
+    Arama sorgusunu ve parametrelerini döndürür.
+    """
+    sql = FLIGHT_SEARCH_SQL
+    params = []
+    if flight_date:
+        sql += " AND TRUNC(f.departureTime) = TO_DATE(:flight_date, 'YYYY-MM-DD')"
+        params.append(flight_date)
+
+    # from_city / to_city filters are kept optional to avoid schema mismatch
+    # Uncomment if columns exist: f.fromCity, f.toCity
+    # if from_city:
+    #     sql += " AND LOWER(f.fromCity) = LOWER(:from_city)"
+    #     params.append(from_city)
+    # if to_city:
+    #     sql += " AND LOWER(f.toCity) = LOWER(:to_city)"
+    #     params.append(to_city)
+
+    sql += " ORDER BY f.departureTime ASC"
+    return sql, params
+
+
+RESERVED_SEATS_SQL = "SELECT seatNo FROM Booking WHERE fNo = :1 AND seatNo IS NOT NULL"
+
+# Booking(bSSN, bookingDate) index'i ile (bkz. final_sql.sql) tek yolcunun satırları
+PASSENGER_TRIPS_SQL = """
+    SELECT b.bookingDate,
+           b.fNo,
+           b.seatNo,
+           b.ticketPrice,
+           b.bSSN
+    FROM Booking b
+    WHERE b.bSSN = :ssn
+    ORDER BY b.bookingDate DESC
+"""
+
+ALL_BOOKINGS_SQL = """
+    SELECT b.bookingDate,
+           b.fNo,
+           b.seatNo,
+           b.ticketPrice,
+           b.bSSN
+    FROM Booking b
+    ORDER BY b.bookingDate DESC
+"""
+
+# 1) GROUP BY + ORDER BY: uçuş başına yolcu sayısı
+REPORT_TOP_FLIGHTS_SQL = """
+    SELECT b.fNo AS flightNo,
+           COUNT(*) AS pax_count,
+           MIN(b.bookingDate) AS first_booking,
+           MAX(b.bookingDate) AS last_booking
+    FROM Booking b
+    GROUP BY b.fNo
+    ORDER BY pax_count DESC, b.fNo
+"""
+
+# 2) Subquery: kapasitesi ortalamanın üstünde olan uçaklar/flightlar
+REPORT_CAPACITY_OVER_AVG_SQL = """
+    SELECT f.flightNo,
+           a.modelNo,
+           a.capacity
+    FROM Flight f
+    JOIN Airplane a ON f.fregNo = a.regNo
+    WHERE a.capacity > (SELECT AVG(capacity) FROM Airplane)
+    ORDER BY a.capacity DESC, f.flightNo
+"""
+
+# 3) GROUP BY: uçuş bazlı toplam bagaj (gate'e göre toplama bellekte yapılır)
+REPORT_BAGS_BY_FLIGHT_SQL = """
+    SELECT b.fNo,
+           NVL(SUM(b.baggageCount), 0) AS total_bags
+    FROM Booking b
+    GROUP BY b.fNo
+"""
+
+# --- Referans verisi (dimensions.DimensionCache) ---------------------------
+DIMENSION_VERSION_SQL = """
+    SELECT (SELECT COUNT(*) FROM Airplane),
+           (SELECT NVL(MAX(ORA_ROWSCN), 0) FROM Airplane),
+           (SELECT COUNT(*) FROM Flight),
+           (SELECT NVL(MAX(ORA_ROWSCN), 0) FROM Flight)
+    FROM dual
+"""
+
+AIRPLANE_DIMENSION_SQL = "SELECT regNo, modelNo, capacity FROM Airplane"
+
+# En yakın/yeni uçuşlar önce; tablo max_rows'tan büyükse kalanlar ihtiyaç oldukça yüklenir
+FLIGHT_DIMENSION_SQL = """
+    SELECT flightNo, departureTime, landingTime, gateNo, fregNo
+    FROM Flight
+    ORDER BY departureTime DESC
+    FETCH FIRST :max_rows ROWS ONLY
+"""
+
+FLIGHT_BY_NO_SQL = """
+    SELECT flightNo, departureTime, landingTime, gateNo, fregNo
+    FROM Flight
+    WHERE flightNo IN ({binds})
+"""
+
+# --- Koltuk sayaçları (inventory.py) --------------------------------------
+INVENTORY_RESERVE_SQL = """
+    UPDATE FlightInventory
+    SET bookedEconomy = bookedEconomy + :eco,
+        bookedBusiness = bookedBusiness + :bus
+    WHERE flightNo = :flight_no
+      AND bookedEconomy + bookedBusiness + held + :eco + :bus <= capacity
+"""
+
+INVENTORY_RELEASE_SQL = """
+    UPDATE FlightInventory
+    SET bookedEconomy = GREATEST(bookedEconomy - :eco, 0),
+        bookedBusiness = GREATEST(bookedBusiness - :bus, 0)
+    WHERE flightNo = :flight_no
+"""
+
+INVENTORY_EXISTS_SQL = "SELECT 1 FROM FlightInventory WHERE flightNo = :flight_no"
+
+# Tek uçuşun sayaçlarını EconomyClass/BusinessClass sayımlarından yeniden yazar
+# (satır yoksa oluşturur). inventory.reconcile bunu sayaç satırını kilitledikten
+# sonra çalıştırır; böylece sayım, satırı tutan yazmanın commit'inden sonra başlar.
+INVENTORY_RECONCILE_SQL = """
+    MERGE INTO FlightInventory i
+    USING (
+        SELECT f.flightNo,
+               a.capacity,
+               (SELECT COUNT(*) FROM EconomyClass e WHERE e.EflightNo = f.flightNo) AS eco,
+               (SELECT COUNT(*) FROM BusinessClass c WHERE c.BflightNo = f.flightNo) AS bus
+        FROM Flight f
+        JOIN Airplane a ON f.fregNo = a.regNo
+        WHERE f.flightNo = :flight_no
+    ) s
+    ON (i.flightNo = s.flightNo)
+    WHEN MATCHED THEN UPDATE SET
+        i.capacity = s.capacity,
+        i.bookedEconomy = s.eco,
+        i.bookedBusiness = s.bus,
+        i.reconciledAt = SYSDATE
+    WHEN NOT MATCHED THEN INSERT (flightNo, capacity, bookedEconomy, bookedBusiness, held, reconciledAt)
+        VALUES (s.flightNo, s.capacity, s.eco, s.bus, 0, SYSDATE)
+"""
+
+INVENTORY_LOCK_SQL = "SELECT 1 FROM FlightInventory WHERE flightNo = :flight_no FOR UPDATE"
+
+INVENTORY_FLIGHTS_SQL = "SELECT flightNo FROM Flight ORDER BY flightNo"
+
+# Reconcile'ı tek süreç çalıştırır: kilit oturum boyunca tutulur (timeout 0, beklemez).
+# DBMS_LOCK.REQUEST: 0 = alındı, 4 = zaten bu oturumda, 1 = başkasında
+INVENTORY_LEADER_LOCK_SQL = """
+    BEGIN
+        :result := DBMS_LOCK.REQUEST(
+            id => :lock_id,
+            lockmode => DBMS_LOCK.X_MODE,
+            timeout => 0,
+            release_on_commit => FALSE
+        );
+    END;
+"""
+
+# --- Şehir otomatik tamamlama (cities.py) -------------------------------
+# Şehir başına kalkış + varış booking sayısı (popülerlik sıralaması için).
+# Flight'ta fromCity/toCity yoksa ORA-00904 verir; cities.py sabit listeye düşer.
+CITY_POPULARITY_SQL = """
+    SELECT city, SUM(bookings) AS bookings
+    FROM (
+        SELECT f.fromCity AS city, COUNT(b.bSSN) AS bookings
+        FROM Flight f
+        LEFT JOIN Booking b ON b.fNo = f.flightNo
+        GROUP BY f.fromCity
+        UNION ALL
+        SELECT f.toCity AS city, COUNT(b.bSSN) AS bookings
+        FROM Flight f
+        LEFT JOIN Booking b ON b.fNo = f.flightNo
+        GROUP BY f.toCity
+    )
+    WHERE city IS NOT NULL
+    GROUP BY city
+"""
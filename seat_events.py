@@ -0,0 +1,152 @@
+import json
+import os
+import queue
+import threading
+import time
+
+# ----------------------------------------------------------------------
+
+# 📡 Koltuk değişikliklerini açık koltuk haritalarına yayınlama (SSE)
+
+# ----------------------------------------------------------------------
+
+
+class SeatHub:
+    """
+    Uçuş başına abone kuyruklarını tutar; booking yazma yolları ``publish`` ile
+    tek noktadan delta (booked/released) gönderir, her açık SSE bağlantısı kendi
+    kuyruğunu okur. Yavaş bir istemcinin kuyruğu dolarsa bekletilmez, ona
+    ``resync`` gönderilir ve istemci JSON endpoint'inden haritayı yeniden çeker.
+
+    Deltalar süreç içidir. Çok worker'lı kurulumda ``attach_backend`` ile paylaşımlı
+    önbellek verilirse her yayın uçuşun sürüm damgasını da değiştirir; diğer
+    worker'lardaki stream'ler damgayı ``poll_interval``'da bir okur ve değiştiyse
+    kendi abonelerine ``resync`` gönderir.
+
+    Her SSE bağlantısı bir worker thread'i tutar: en fazla ``max_streams`` açık
+    stream olur (route fazlasını 503 ile reddeder, istemci polling'e düşer) ve
+    her stream ``max_age`` saniye sonra kapanır (istemci yeniden bağlanıp resync yapar).
+    """
+
+    def __init__(self, max_queue=256, max_streams=50, max_age=300.0, poll_interval=2.0):
+        self.max_queue = max_queue
+        self.max_streams = max_streams
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._subscribers = {}
+        self._count = 0
+        self._published = {}
+        self._lock = threading.Lock()
+
+    def attach_backend(self, backend):
+        self.backend = backend
+
+    def has_capacity(self):
+        return self._count < self.max_streams
+
+    def subscribe(self, flight_no):
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(str(flight_no), set()).add(q)
+            self._count += 1
+        return q
+
+    def unsubscribe(self, flight_no, q):
+        with self._lock:
+            subs = self._subscribers.get(str(flight_no))
+            if subs is not None and q in subs:
+                subs.discard(q)
+                self._count -= 1
+                if not subs:
+                    del self._subscribers[str(flight_no)]
+
+    def publish(self, flight_no, event, seat):
+        """
+        ``event``: "booked" veya "released".
+        """
+        if not seat:
+            return
+        self._bump(flight_no)
+        message = {"event": event, "seat": seat}
+        with self._lock:
+            subs = list(self._subscribers.get(str(flight_no), ()))
+        for q in subs:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                _drain(q)
+                q.put_nowait({"event": "resync"})
+
+    def resync(self, flight_no):
+        """
+        Toplu işlemlerden sonra tek tek delta yerine tam yenileme ister.
+        """
+        self._bump(flight_no)
+        with self._lock:
+            subs = list(self._subscribers.get(str(flight_no), ()))
+        for q in subs:
+            _drain(q)
+            q.put_nowait({"event": "resync"})
+
+    def stream(self, flight_no, heartbeat=15.0):
+        """
+        ``text/event-stream`` gövdesi üreten generator. İstemci bağlantıyı
+        kapatınca (GeneratorExit) abonelik silinir.
+        """
+        q = self.subscribe(flight_no)
+        wait = heartbeat if self.backend is None else min(heartbeat, self.poll_interval)
+        seen = self._version(flight_no)
+        started = last_sent = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() - started < self.max_age:
+                try:
+                    message = q.get(timeout=wait)
+                except queue.Empty:
+                    message = None
+                if message is None and self.backend is not None:
+                    version = self._version(flight_no)
+                    if version != seen:
+                        seen = version
+                        # Bu worker'ın kendi yayını ise deltalar zaten kuyruğa geldi
+                        if version != self._published.get(str(flight_no)):
+                            message = {"event": "resync"}
+                if message is None:
+                    if time.monotonic() - last_sent >= heartbeat:
+                        # Proxy'lerin bağlantıyı kapatmaması için yorum satırı
+                        yield ": keep-alive\n\n"
+                        last_sent = time.monotonic()
+                    continue
+                yield f"event: {message['event']}\ndata: {json.dumps(message)}\n\n"
+                last_sent = time.monotonic()
+        finally:
+            self.unsubscribe(flight_no, q)
+
+    # --- Worker'lar arası sürüm damgası ---------------------------------------
+    def _bump(self, flight_no):
+        if self.backend is None:
+            return
+        stamp = (os.getpid(), time.time_ns())
+        self._published[str(flight_no)] = stamp
+        self.backend.set(("seat_version", str(flight_no)), stamp)
+
+    def _version(self, flight_no):
+        if self.backend is None:
+            return None
+        hit = self.backend.get(("seat_version", str(flight_no)))
+        return hit[0] if hit else None
+
+
+def _drain(q):
+    try:
+        while True:
+            q.get_nowait()
+    except queue.Empty:
+        pass
+
+
+seat_hub = SeatHub(
+    max_streams=int(os.environ.get("SEAT_STREAM_MAX", "50")),
+    max_age=float(os.environ.get("SEAT_STREAM_MAX_SECONDS", "300")),
+)
@@ -0,0 +1,209 @@
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: paylaşımlı önbellek yok, süreç içi önbelleğe düşülür
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+# 🧩 Worker'lar arası paylaşımlı önbellek (memory-mapped dosya)
+
+# ----------------------------------------------------------------------
+# Dosya düzeni:
+#   header : magic, format, slot sayısı, slot boyu, generation (sürüm damgası)
+#   slot   : seq, key hash, generation, stored_at, uzunluk, payload (pickle)
+# Slotlar WAYS'lik kovalara (set-associative) bölünür; anahtar hash'i kovayı seçer.
+#
+# - Okuma kilitsizdir (seqlock): yazan seq'i tek sayıya çekip yazar, sonra çift
+#   yapar; okuyan seq'in okuma öncesi/sonrası aynı ve çift olduğunu kontrol eder.
+# - Yazma yalnızca ilgili kovayı kilitler (fcntl byte-range lock + süreç içi lock).
+# - clear() header'daki generation'ı artırır; eski generation'daki tüm kayıtlar
+#   bütün worker'lar için aynı anda geçersiz olur.
+#
+# Dosya yalnızca uygulama kullanıcısının yazabileceği bir yerde olmalıdır
+# (ör. /dev/shm); payload pickle ile okunur.
+
+MAGIC = b"SVC1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIIQ")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<IxxxxQQdI")
+WAYS = 4
+READ_RETRIES = 5
+
+
+def _key_hash(key):
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 = boş slot
+
+
+class MmapBackend:
+    """
+    ``StaleCache`` için paylaşımlı saklama katmanı. Boyut sabittir
+    (``slots * slot_bytes``); kova doluysa en eski kayıt atılır, slot'a
+    sığmayan değerler önbelleğe alınmaz.
+    """
+
+    def __init__(self, path, slots=4096, slot_bytes=16384):
+        if fcntl is None:
+            raise OSError("fcntl bu platformda yok")
+        self.path = path
+        self.slot_bytes = slot_bytes
+        self.slots = max(WAYS, slots - slots % WAYS)
+        self.buckets = self.slots // WAYS
+        self.payload_limit = slot_bytes - SLOT.size
+        self.size = HEADER_SIZE + self.slots * slot_bytes
+        self._local_locks = [threading.Lock() for _ in range(64)]
+        self._header_lock = threading.Lock()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, FORMAT_VERSION, self.slots, slot_bytes, 1), 0)
+            magic, version, n_slots, n_bytes, _ = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+            if (magic, version, n_slots, n_bytes) != (MAGIC, FORMAT_VERSION, self.slots, slot_bytes):
+                raise OSError(f"{path}: farklı düzende bir önbellek dosyası")
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+        self._mm = mmap.mmap(self._fd, self.size)
+
+    # --- Yardımcılar ---------------------------------------------------------
+    def _generation(self):
+        return HEADER.unpack_from(self._mm, 0)[4]
+
+    def _slot_offset(self, index):
+        return HEADER_SIZE + index * self.slot_bytes
+
+    def _bucket(self, key_hash):
+        return key_hash % self.buckets
+
+    def _read_slot(self, offset):
+        """
+        Tutarlı bir (seq çift ve değişmemiş) slot görüntüsü döndürür, yoksa None.
+        """
+        for _ in range(READ_RETRIES):
+            seq, key_hash, generation, stored_at, length = SLOT.unpack_from(self._mm, offset)
+            if seq & 1:
+                continue
+            payload = None
+            if key_hash and 0 < length <= self.payload_limit:
+                start = offset + SLOT.size
+                payload = self._mm[start:start + length]
+            if struct.unpack_from("<I", self._mm, offset)[0] == seq:
+                return key_hash, generation, stored_at, payload
+        return None
+
+    def _write_slot(self, offset, key_hash, generation, stored_at, payload):
+        seq = struct.unpack_from("<I", self._mm, offset)[0]
+        struct.pack_into("<I", self._mm, offset, (seq + 1) & 0xFFFFFFFF)
+        if payload:
+            start = offset + SLOT.size
+            self._mm[start:start + len(payload)] = payload
+        SLOT.pack_into(self._mm, offset, (seq + 1) & 0xFFFFFFFF, key_hash, generation, stored_at, len(payload or b""))
+        struct.pack_into("<I", self._mm, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def _lock_bucket(self, bucket):
+        local = self._local_locks[bucket % len(self._local_locks)]
+        local.acquire()
+        start = self._slot_offset(bucket * WAYS)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, WAYS * self.slot_bytes, start)
+        return local, start
+
+    def _unlock_bucket(self, local, start):
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, WAYS * self.slot_bytes, start)
+        local.release()
+
+    # --- Backend arayüzü -----------------------------------------------------
+    def get(self, key):
+        """
+        ``(value, stored_at)`` veya None.
+        """
+        key_hash = _key_hash(key)
+        generation = self._generation()
+        first = self._bucket(key_hash) * WAYS
+        for index in range(first, first + WAYS):
+            slot = self._read_slot(self._slot_offset(index))
+            if slot and slot[0] == key_hash and slot[1] == generation and slot[3] is not None:
+                try:
+                    return pickle.loads(slot[3]), slot[2]
+                except Exception:
+                    return None
+        return None
+
+    def set(self, key, value, stored_at=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.payload_limit:
+            logger.debug("Önbellek değeri slot'a sığmadı (%d bayt): %s", len(payload), key)
+            return False
+        key_hash = _key_hash(key)
+        bucket = self._bucket(key_hash)
+        local, start = self._lock_bucket(bucket)
+        try:
+            generation = self._generation()
+            victim, victim_age = None, None
+            for index in range(bucket * WAYS, bucket * WAYS + WAYS):
+                offset = self._slot_offset(index)
+                _, slot_hash, slot_gen, slot_stored, _ = SLOT.unpack_from(self._mm, offset)
+                if slot_hash == key_hash or not slot_hash or slot_gen != generation:
+                    victim = offset
+                    break
+                if victim is None or slot_stored < victim_age:
+                    victim, victim_age = offset, slot_stored
+            self._write_slot(victim, key_hash, generation, stored_at or time.time(), payload)
+            return True
+        finally:
+            self._unlock_bucket(local, start)
+
+    def delete(self, key):
+        key_hash = _key_hash(key)
+        bucket = self._bucket(key_hash)
+        local, start = self._lock_bucket(bucket)
+        try:
+            for index in range(bucket * WAYS, bucket * WAYS + WAYS):
+                offset = self._slot_offset(index)
+                if SLOT.unpack_from(self._mm, offset)[1] == key_hash:
+                    self._write_slot(offset, 0, 0, 0.0, None)
+        finally:
+            self._unlock_bucket(local, start)
+
+    def clear(self):
+        """
+        Generation'ı artırır: tüm worker'larda tüm kayıtlar anında geçersiz olur.
+        """
+        with self._header_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+            try:
+                magic, version, n_slots, n_bytes, generation = HEADER.unpack_from(self._mm, 0)
+                HEADER.pack_into(self._mm, 0, magic, version, n_slots, n_bytes, generation + 1)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+
+
+def from_env():
+    """
+    SHARED_CACHE_PATH tanımlıysa paylaşımlı backend döndürür, değilse None.
+    """
+    path = os.environ.get("SHARED_CACHE_PATH")
+    if not path:
+        return None
+    try:
+        return MmapBackend(
+            path,
+            slots=int(os.environ.get("SHARED_CACHE_SLOTS", "4096")),
+            slot_bytes=int(os.environ.get("SHARED_CACHE_SLOT_BYTES", "16384")),
+        )
+    except OSError as e:
+        logger.warning("Paylaşımlı önbellek açılamadı, süreç içi önbellek kullanılacak: %s", e)
+        return None
@@ -152,3 +152,39 @@ document.addEventListener('keydown', (e) => {
     closeGlobeModal()
   }
 })
+
+// City autocomplete (served from the in-memory index at /api/cities)
+function setupCityAutocomplete(inputId) {
+  const input = document.getElementById(inputId)
+  const list = input && input.list
+  if (!list) return
+
+  let timer = null
+  let controller = null
+  input.addEventListener('input', () => {
+    clearTimeout(timer)
+    const query = input.value.trim()
+    if (!query) {
+      list.innerHTML = ''
+      return
+    }
+    timer = setTimeout(() => {
+      controller?.abort()
+      controller = new AbortController()
+      fetch(`/api/cities?q=${encodeURIComponent(query)}&limit=8`, { signal: controller.signal })
+        .then((res) => (res.ok ? res.json() : { cities: [] }))
+        .then((data) => {
+          list.innerHTML = ''
+          data.cities.forEach((city) => {
+            const option = document.createElement('option')
+            option.value = city
+            list.appendChild(option)
+          })
+        })
+        .catch(() => {})
+    }, 120)
+  })
+}
+
+setupCityAutocomplete('departure-input')
+setupCityAutocomplete('arrival-input')
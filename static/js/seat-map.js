@@ -23,6 +23,73 @@ function loadSeatMap() {
 
   container.innerHTML = ""
   renderSeats(container)
+
+  if (typeof SEAT_FLIGHT_NO !== 'undefined' && SEAT_FLIGHT_NO) {
+    subscribeSeatUpdates(SEAT_FLIGHT_NO)
+  }
+}
+
+// Live seat availability (SSE deltas + JSON resync with ETag)
+let seatAvailabilityEtag = null
+// SSE kaçırılırsa (başka worker, stream sınırı, proxy) ETag'li polling yakalar
+const SEAT_POLL_MS = 30000
+
+function subscribeSeatUpdates(flightNo) {
+  const base = `/api/flights/${encodeURIComponent(flightNo)}/seats`
+  setInterval(() => refreshSeatAvailability(base), SEAT_POLL_MS)
+  if (typeof EventSource === "undefined") return
+
+  const source = new EventSource(`${base}/stream`)
+
+  source.addEventListener("booked", (e) => applySeatDelta(JSON.parse(e.data).seat, true))
+  source.addEventListener("released", (e) => applySeatDelta(JSON.parse(e.data).seat, false))
+  source.addEventListener("resync", () => refreshSeatAvailability(base))
+  // Bağlantı koptuktan sonra kaçırılan deltalar için tam listeyi çek
+  source.addEventListener("open", () => refreshSeatAvailability(base))
+}
+
+function refreshSeatAvailability(url) {
+  const headers = seatAvailabilityEtag ? { "If-None-Match": seatAvailabilityEtag } : {}
+  fetch(url, { headers, cache: "no-cache" })
+    .then((res) => {
+      if (res.status === 304 || !res.ok) return null
+      seatAvailabilityEtag = res.headers.get("ETag")
+      return res.json()
+    })
+    .then((data) => {
+      if (!data) return
+      const reserved = new Set(data.reserved)
+      document.querySelectorAll(".seat[data-seat-id]").forEach((seat) => {
+        applySeatDelta(seat.getAttribute("data-seat-id"), reserved.has(seat.getAttribute("data-seat-id")))
+      })
+    })
+    .catch(() => {})
+}
+
+function applySeatDelta(seatId, booked) {
+  const index = RESERVED_SEATS.indexOf(seatId)
+  if (booked && index === -1) RESERVED_SEATS.push(seatId)
+  if (!booked && index !== -1) RESERVED_SEATS.splice(index, 1)
+
+  const seat = document.querySelector(`.seat[data-seat-id="${seatId}"]`)
+  if (!seat) return
+
+  if (booked) {
+    // Başkası aldıysa kullanıcının seçiminden de çıkar
+    const selected = JSON.parse(localStorage.getItem(STORAGE_KEYS.SEATS) || "[]")
+    if (selected.includes(seatId)) {
+      selected.splice(selected.indexOf(seatId), 1)
+      localStorage.setItem(STORAGE_KEYS.SEATS, JSON.stringify(selected))
+      updateSeatCount()
+    }
+    seat.classList.remove("available", "selected")
+    seat.classList.add("reserved")
+    seat.disabled = true
+  } else if (seat.classList.contains("reserved")) {
+    seat.classList.remove("reserved")
+    seat.classList.add("available")
+    seat.disabled = false
+  }
 }
 
 // Render all seats
@@ -0,0 +1,26 @@
+import time
+
+from cache import StaleCache
+
+
+def test_entry_loaded_before_write_is_a_miss():
+    worker = StaleCache(ttl=300)  # paylaşımlı backend yok: worker'ın kendi belleği
+    worker.get("ssn", lambda: (["eski"], None))
+
+    written_at = time.time()  # başka bir worker'daki yazma (session damgası)
+    value, err, stale = worker.get("ssn", lambda: (["yeni"], None), min_loaded_at=written_at)
+    assert value == ["yeni"]
+    assert worker.get("ssn", lambda: (["tekrar"], None), min_loaded_at=written_at)[0] == ["yeni"]
+
+
+def test_loaded_at_is_taken_before_the_query():
+    cache = StaleCache(ttl=300)
+    written = []
+
+    def slow_loader():
+        written.append(time.time())  # sorgu sürerken commit edilen yazma
+        return ["yazma öncesi görüntü"], None
+
+    cache.get("ssn", slow_loader)
+    value, _, _ = cache.get("ssn", lambda: (["güncel"], None), min_loaded_at=written[0])
+    assert value == ["güncel"]
@@ -0,0 +1,119 @@
+import multiprocessing
+import struct
+import time
+
+import pytest
+
+import shared_cache
+from cache import StaleCache
+
+pytestmark = pytest.mark.skipif(shared_cache.fcntl is None, reason="fcntl yok (Windows)")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shared.cache")
+
+
+def make(path, slots=16, slot_bytes=512):
+    return shared_cache.MmapBackend(path, slots=slots, slot_bytes=slot_bytes)
+
+
+def test_roundtrip_between_instances(path):
+    writer, reader = make(path), make(path)
+    assert writer.set(("read", "k"), [1, "a"], stored_at=123.0)
+    assert reader.get(("read", "k")) == ([1, "a"], 123.0)
+    assert reader.get(("trips", "k")) is None
+
+
+def test_delete(path):
+    backend = make(path)
+    backend.set("k", 1)
+    backend.delete("k")
+    assert backend.get("k") is None
+
+
+def test_clear_invalidates_for_every_instance(path):
+    a, b = make(path), make(path)
+    a.set("x", 1)
+    a.set("y", 2)
+    b.clear()
+    assert a.get("x") is None and a.get("y") is None
+    a.set("x", 3)
+    assert b.get("x")[0] == 3
+
+
+def test_oversized_value_is_not_stored(path):
+    backend = make(path, slot_bytes=256)
+    assert backend.set("big", "x" * 1000) is False
+    assert backend.get("big") is None
+
+
+def test_size_is_bounded_and_latest_write_survives(path):
+    backend = make(path, slots=8)
+    for i in range(200):
+        assert backend.set(i, i)
+        assert backend.get(i)[0] == i
+    assert sum(backend.get(i) is not None for i in range(200)) <= 8
+
+
+def test_eviction_prefers_oldest_in_bucket(path):
+    backend = make(path, slots=4)  # tek kova
+    for i in range(4):
+        backend.set(i, i, stored_at=100.0 + i)
+    backend.set("new", "v", stored_at=200.0)
+    assert backend.get(0) is None
+    assert [backend.get(i)[0] for i in (1, 2, 3)] == [1, 2, 3]
+
+
+def test_reader_skips_slot_being_written(path):
+    backend = make(path, slots=4)
+    backend.set("k", 1)
+    for index in range(backend.slots):
+        offset = backend._slot_offset(index)
+        seq = struct.unpack_from("<I", backend._mm, offset)[0]
+        struct.pack_into("<I", backend._mm, offset, seq | 1)  # yazma ortasında
+    assert backend.get("k") is None
+
+
+def test_layout_mismatch_is_rejected(path):
+    make(path, slots=16, slot_bytes=512)
+    with pytest.raises(OSError):
+        make(path, slots=32, slot_bytes=512)
+
+
+def _hammer(path, worker):
+    backend = make(path)
+    for i in range(500):
+        backend.set(i % 8, (worker, i, "x" * (i % 100)))
+        hit = backend.get((i + 1) % 8)
+        if hit is not None:
+            w, n, pad = hit[0]
+            assert pad == "x" * (n % 100)
+
+
+def test_concurrent_writers_never_expose_torn_values(path):
+    make(path)
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_hammer, args=(path, w)) for w in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+    assert [proc.exitcode for proc in procs] == [0, 0, 0, 0]
+
+
+def test_stale_cache_serves_value_that_outgrew_its_slot(path):
+    cache = StaleCache(ttl=0, backend=make(path, slots=8, slot_bytes=512), namespace="read")
+    value, err, stale = cache.get("flights", lambda: (["small"], None))
+    assert value == ["small"]
+
+    big = [f"{i:0100d}" for i in range(20)]
+    cache.get("flights", lambda: (big, None))  # süresi dolmuş: arka planda yenilenir
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        value, err, stale = cache.get("flights", lambda: (big, None))
+        if value == big:
+            break
+        time.sleep(0.01)
+    assert value == big
@@ -0,0 +1,201 @@
+"""
+Sorgu ölçeklenme regresyon paketi.
+
+Her ölçek için ``tools.synthetic_data`` ile bir veri seti üretir, uygulamanın
+okuma sorgularını (``queries.py``) çalıştırıp süre ve plan kaydeder, sonra:
+
+- ardışık ölçekler arasında süre büyüme üssü n·log n'in üssünü
+  ``--max-exponent - 1`` kadar aşarsa (ör. 10x veri → 30x süre) super-linear
+  ölçeklenme hatası verir; ORDER BY / GROUP BY'ın doğal n·log n büyümesi hata sayılmaz,
+- ``--baseline`` dosyası verilmişse, süre ``--tolerance`` oranından fazla
+  kötüleşen veya planı değişen sorgular için hata verir.
+
+Hata varsa çıkış kodu 1'dir (CI'da kullanılabilir).
+
+Örnek:
+    python -m tools.query_scaling --scales 10000,100000,1000000
+    python -m tools.query_scaling --baseline tools/scaling_baseline.json --update-baseline
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queries  # noqa: E402
+from tools import synthetic_data  # noqa: E402
+
+# Bu sürenin altındaki ölçümler gürültü sayılır, üs kontrolüne girmez
+NOISE_FLOOR_S = 0.005
+
+
+def _hot_flight(conn):
+    return conn.execute(queries.REPORT_TOP_FLIGHTS_SQL).fetchone()[0]
+
+
+def _frequent_passenger(conn):
+    return conn.execute(
+        "SELECT bSSN FROM Booking GROUP BY bSSN ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0]
+
+
+def _busy_date(conn):
+    return conn.execute(
+        "SELECT substr(departureTime, 1, 10) AS d FROM Flight GROUP BY d ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0]
+
+
+def app_queries(conn):
+    """
+    (isim, sql, parametreler) listesi; parametreler veri setinden seçilir.
+    """
+    flights_sql, flights_params = queries.flight_search()
+    by_date_sql, by_date_params = queries.flight_search(flight_date=_busy_date(conn))
+    return [
+        ("fetch_flights", flights_sql, flights_params),
+        ("fetch_flights_by_date", by_date_sql, by_date_params),
+        ("reserved_seats", queries.RESERVED_SEATS_SQL, [_hot_flight(conn)]),
+        ("passenger_trips", queries.PASSENGER_TRIPS_SQL, {"ssn": _frequent_passenger(conn)}),
+        ("fetch_all_bookings", queries.ALL_BOOKINGS_SQL, []),
+        ("report_top_flights", queries.REPORT_TOP_FLIGHTS_SQL, []),
+        ("report_capacity_over_avg", queries.REPORT_CAPACITY_OVER_AVG_SQL, []),
+        ("report_bags_by_flight", queries.REPORT_BAGS_BY_FLIGHT_SQL, []),
+        ("city_popularity", queries.CITY_POPULARITY_SQL, []),
+    ]
+
+
+def _plan(conn, sql, params):
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def measure(conn, repeat):
+    """
+    Sorgu başına medyan süreyi (fetch dahil), satır sayısını ve planı döndürür.
+    İlk çalıştırma sayfa önbelleğini ısıtmak için ölçüme katılmaz.
+    """
+    results = {}
+    for name, sql, params in app_queries(conn):
+        rows = len(conn.execute(sql, params).fetchall())
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append(time.perf_counter() - started)
+        results[name] = {"seconds": statistics.median(timings), "rows": rows, "plan": _plan(conn, sql, params)}
+    return results
+
+
+def run(scales, repeat, workdir, seed):
+    measurements = {}
+    for scale in scales:
+        # Seed/şema sürümü dosya adında: --workdir'deki eski veri setleriyle karşılaştırılmaz
+        path = os.path.join(workdir, f"skyvoyage_{scale}_seed{seed}_v{synthetic_data.SCHEMA_VERSION}.db")
+        if not os.path.exists(path):
+            conn = synthetic_data.connect(path)
+            synthetic_data.generate(conn, scale, seed=seed)
+            conn.close()
+        conn = synthetic_data.connect(path)
+        try:
+            measurements[scale] = measure(conn, repeat)
+        finally:
+            conn.close()
+    return measurements
+
+
+def nlogn_exponent(small, large):
+    """
+    n·log n büyümenin iki ölçek arasındaki üssü (10k -> 50k için ~1.10).
+    """
+    return 1 + math.log(math.log(large) / math.log(small)) / math.log(large / small)
+
+
+def check_scaling(measurements, max_exponent):
+    failures = []
+    scales = sorted(measurements)
+    for small, large in zip(scales, scales[1:]):
+        limit = nlogn_exponent(small, large) + (max_exponent - 1)
+        for name, result in measurements[large].items():
+            t_small = measurements[small][name]["seconds"]
+            t_large = result["seconds"]
+            # Küçük ölçek gürültü tabanının altındaysa oran anlamsız
+            if t_small < NOISE_FLOOR_S or t_large < NOISE_FLOOR_S:
+                continue
+            exponent = math.log(t_large / t_small) / math.log(large / small)
+            if exponent > limit:
+                failures.append(
+                    f"{name}: {small} -> {large} booking arası süre üssü {exponent:.2f} > {limit:.2f}"
+                )
+    return failures
+
+
+def check_baseline(measurements, baseline, tolerance):
+    failures = []
+    for scale, results in measurements.items():
+        expected = baseline.get(str(scale), {})
+        for name, result in results.items():
+            base = expected.get(name)
+            if not base:
+                continue
+            if result["plan"] != base["plan"]:
+                failures.append(f"{name} @ {scale}: plan değişti {base['plan']} -> {result['plan']}")
+            budget = max(base["seconds"], NOISE_FLOOR_S) * (1 + tolerance)
+            if result["seconds"] > budget:
+                failures.append(
+                    f"{name} @ {scale}: {result['seconds'] * 1000:.1f} ms > bütçe {budget * 1000:.1f} ms"
+                )
+    return failures
+
+
+def report(measurements):
+    names = list(next(iter(measurements.values())))
+    scales = sorted(measurements)
+    print(f"{'query':<28}" + "".join(f"{scale:>14}" for scale in scales))
+    for name in names:
+        cells = "".join(f"{measurements[s][name]['seconds'] * 1000:>11.1f} ms" for s in scales)
+        print(f"{name:<28}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SkyVoyage sorgu ölçeklenme kontrolü")
+    parser.add_argument("--scales", default="10000,50000,250000", help="virgülle ayrılmış booking sayıları")
+    parser.add_argument("--repeat", type=int, default=7, help="ölçüm tekrarı (medyan alınır)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=None, help="üretilen veri setlerinin saklanacağı klasör (yeniden kullanılır)")
+    parser.add_argument("--max-exponent", type=float, default=1.3, help="n·log n'e göre izin verilen büyüme üssü (1.3 = n·log n üssü + 0.3)")
+    parser.add_argument("--baseline", default=None, help="karşılaştırma için JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="baseline süresine izin verilen oransal artış")
+    parser.add_argument("--update-baseline", action="store_true", help="ölçümleri baseline dosyasına yaz")
+    args = parser.parse_args(argv)
+
+    scales = sorted(int(s) for s in args.scales.split(",") if s.strip())
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        measurements = run(scales, args.repeat, args.workdir, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            measurements = run(scales, args.repeat, workdir, args.seed)
+
+    report(measurements)
+    failures = check_scaling(measurements, args.max_exponent)
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({str(k): v for k, v in measurements.items()}, f, indent=2, ensure_ascii=False)
+        print(f"Baseline yazıldı: {args.baseline}")
+    elif args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            failures += check_baseline(measurements, json.load(f), args.tolerance)
+
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Sentetik veri üreteci.
+
+Airplane / Flight / Passenger / Booking / EconomyClass / BusinessClass
+tablolarını gerçekçi dağılımlarla (popüler rotalara yığılan talep, uçak
+kapasitesini aşmayan koltuk ataması, ön sıralarda Business) yerel bir
+SQLite dosyasına üretir. SQLite, Oracle'a özgü TRUNC / TO_DATE / NVL
+fonksiyonları kaydedilerek uygulamanın sorgularını değiştirmeden çalıştırır.
+
+Örnek:
+    python -m tools.synthetic_data --bookings 100000 --out /tmp/skyvoyage.db
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from city_names import CITIES  # noqa: E402
+
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+SEAT_COLUMNS = "ABCDEF"
+BUSINESS_ROWS = 4
+INSERT_BATCH = 50000
+# Şema veya üretim mantığı değişince artırılır; query_scaling eski dosyaları yeniden kullanmaz
+SCHEMA_VERSION = 2
+
+AIRCRAFT_MODELS = [
+    ("Airbus A320", 180),
+    ("Airbus A321neo", 220),
+    ("Boeing 737-800", 186),
+    ("Boeing 737 MAX 8", 174),
+    ("Airbus A330-300", 288),
+    ("Boeing 777-300ER", 348),
+    ("Boeing 787-9", 294),
+]
+
+GATES = [f"{terminal}{number}" for terminal in "ABCDEF" for number in range(1, 41)]
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Emre", "Elif", "Can", "Zeynep", "Burak", "Deniz", "Ece", "Mert"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan", "Kılıç"]
+
+SCHEMA = """
+CREATE TABLE Airplane (
+    regNo TEXT PRIMARY KEY,
+    modelNo TEXT NOT NULL,
+    capacity INTEGER NOT NULL
+);
+CREATE TABLE Flight (
+    flightNo TEXT PRIMARY KEY,
+    departureTime TEXT NOT NULL,
+    landingTime TEXT,
+    gateNo TEXT,
+    fregNo TEXT NOT NULL REFERENCES Airplane(regNo),
+    fromCity TEXT,
+    toCity TEXT
+);
+CREATE TABLE Passenger (
+    SSN TEXT PRIMARY KEY,
+    email TEXT,
+    firstName TEXT,
+    lastName TEXT,
+    gender TEXT,
+    dateOfBirth TEXT,
+    phoneNumber TEXT
+);
+CREATE TABLE Booking (
+    fNo TEXT NOT NULL REFERENCES Flight(flightNo),
+    bSSN TEXT NOT NULL REFERENCES Passenger(SSN),
+    bookingDate TEXT NOT NULL,
+    seatNo TEXT,
+    ticketPrice REAL,
+    baggageCount INTEGER,
+    PRIMARY KEY (fNo, bSSN, bookingDate)
+);
+CREATE INDEX booking_ssn_date_ix ON Booking (bSSN, bookingDate DESC);
+CREATE TABLE FlightInventory (
+    flightNo TEXT PRIMARY KEY REFERENCES Flight(flightNo),
+    capacity INTEGER NOT NULL,
+    bookedEconomy INTEGER NOT NULL DEFAULT 0,
+    bookedBusiness INTEGER NOT NULL DEFAULT 0,
+    held INTEGER NOT NULL DEFAULT 0,
+    reconciledAt TEXT
+);
+CREATE TABLE EconomyClass (
+    EflightNo TEXT NOT NULL,
+    ESSN TEXT NOT NULL,
+    EbookingDate TEXT NOT NULL,
+    PRIMARY KEY (EflightNo, ESSN, EbookingDate)
+);
+CREATE TABLE BusinessClass (
+    BflightNo TEXT NOT NULL,
+    BSSN TEXT NOT NULL,
+    BbookingDate TEXT NOT NULL,
+    PRIMARY KEY (BflightNo, BSSN, BbookingDate)
+);
+"""
+
+
+# ----------------------------------------------------------------------
+
+# 🔌 Oracle fonksiyonlarının SQLite karşılıkları
+
+# ----------------------------------------------------------------------
+
+def _trunc(value):
+    return value[:10] + " 00:00:00" if value else None
+
+
+def _to_date(value, fmt):
+    if value is None:
+        return None
+    py_fmt = fmt.upper().replace("YYYY", "%Y").replace("MM", "%m").replace("DD", "%d")
+    return datetime.strptime(value, py_fmt).strftime(DATE_FMT)
+
+
+def _nvl(value, default):
+    return default if value is None else value
+
+
+def connect(path):
+    """
+    Oracle uyumlu fonksiyonlar kayıtlı bir SQLite bağlantısı açar.
+    """
+    conn = sqlite3.connect(path)
+    # Varsayılan 2 MB sayfa önbelleği orta ölçeklerde yapay bir performans uçurumu yaratır
+    conn.execute("PRAGMA cache_size = -262144")
+    conn.create_function("TRUNC", 1, _trunc, deterministic=True)
+    conn.create_function("TO_DATE", 2, _to_date, deterministic=True)
+    conn.create_function("NVL", 2, _nvl, deterministic=True)
+    return conn
+
+
+# ----------------------------------------------------------------------
+
+# 🏭 Üretim
+
+# ----------------------------------------------------------------------
+
+def _zipf_weights(n, skew):
+    return [1.0 / (rank ** skew) for rank in range(1, n + 1)]
+
+
+def _seat_label(index):
+    return f"{index // len(SEAT_COLUMNS) + 1}{SEAT_COLUMNS[index % len(SEAT_COLUMNS)]}"
+
+
+def _coprime_stride(rng, capacity):
+    while True:
+        stride = rng.randrange(1, capacity)
+        a, b = stride, capacity
+        while b:
+            a, b = b, a % b
+        if a == 1:
+            return stride
+
+
+def _insert(conn, sql, rows):
+    for start in range(0, len(rows), INSERT_BATCH):
+        conn.executemany(sql, rows[start:start + INSERT_BATCH])
+
+
+def generate(conn, bookings, seed=42, route_skew=1.1, load_factor=0.65, start=None):
+    """
+    Verilen bağlantıya ``bookings`` adet booking içeren bir veri seti üretir.
+    Uçuş sayısı, ortalama doluluk ``load_factor`` olacak şekilde ölçeklenir;
+    rotalar Zipf(``route_skew``) dağılımıyla popülerlik alır.
+    Üretilen tablo boyutlarını içeren bir sözlük döndürür.
+    """
+    if not 0 < load_factor < 1:
+        raise ValueError("load_factor 0 ile 1 arasında olmalı")
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1)
+    conn.executescript(SCHEMA)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    # Airplane
+    avg_capacity = sum(c for _, c in AIRCRAFT_MODELS) / len(AIRCRAFT_MODELS)
+    n_flights = max(20, int(bookings / (avg_capacity * load_factor)) + 1)
+    n_planes = max(10, n_flights // 60)
+    airplanes = []
+    for i in range(n_planes):
+        model, capacity = rng.choice(AIRCRAFT_MODELS)
+        airplanes.append((f"TC-{i:05d}", model, capacity))
+    _insert(conn, "INSERT INTO Airplane VALUES (?, ?, ?)", airplanes)
+
+    # Routes + Flight
+    routes = [(a, b) for a in CITIES for b in CITIES if a != b]
+    rng.shuffle(routes)
+    route_weights = _zipf_weights(len(routes), route_skew)
+    route_cum_weights = list(itertools.accumulate(route_weights))
+    span_minutes = 365 * 24 * 60
+    flights = []
+    total_capacity = 0
+    # Rastgele uçak seçimi toplam kapasiteyi düşürebilir: booking'ler sığana kadar uçuş ekle
+    while len(flights) < n_flights or total_capacity < bookings:
+        i = len(flights)
+        route = rng.choices(range(len(routes)), cum_weights=route_cum_weights)[0]
+        reg_no, _, capacity = airplanes[rng.randrange(n_planes)]
+        total_capacity += capacity
+        departure = start + timedelta(minutes=rng.randrange(span_minutes) // 5 * 5)
+        landing = departure + timedelta(minutes=rng.randrange(60, 13 * 60, 5))
+        flights.append(
+            (
+                str(100000 + i),
+                departure.strftime(DATE_FMT),
+                landing.strftime(DATE_FMT),
+                rng.choice(GATES),
+                reg_no,
+                routes[route][0],
+                routes[route][1],
+                capacity,
+                route,
+            )
+        )
+    n_flights = len(flights)
+    _insert(conn, "INSERT INTO Flight VALUES (?, ?, ?, ?, ?, ?, ?)", [f[:7] for f in flights])
+
+    # Passenger: müdavim yolcular birden fazla booking yapar
+    n_passengers = max(1, bookings // 3)
+    passengers = []
+    for i in range(n_passengers):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        dob = datetime(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55))
+        passengers.append(
+            (
+                f"{10000000000 + i}",
+                f"user{i}@example.com",
+                first,
+                last,
+                rng.choice("MFU"),
+                dob.strftime(DATE_FMT),
+                f"+90 5{rng.randrange(10**9):09d}",
+            )
+        )
+    _insert(conn, "INSERT INTO Passenger VALUES (?, ?, ?, ?, ?, ?, ?)", passengers)
+    del passengers
+
+    # Booking: uçuşlar rota popülerliğine göre seçilir, koltuklar kapasite
+    # içinde rastgele bir permütasyonla (stride) tekrarsız dağıtılır.
+    flight_weights = [route_weights[f[8]] for f in flights]
+    sold = [0] * n_flights
+    strides = [_coprime_stride(rng, f[7]) for f in flights]
+    offsets = [rng.randrange(f[7]) for f in flights]
+    passenger_weights = _zipf_weights(n_passengers, 0.6)
+    picks = rng.choices(range(n_flights), weights=flight_weights, k=bookings)
+    ssn_picks = rng.choices(range(n_passengers), weights=passenger_weights, k=bookings)
+
+    booking_rows, economy_rows, business_rows = [], [], []
+    for n, (idx, pidx) in enumerate(zip(picks, ssn_picks)):
+        # Dolu uçuştan sonraki boş uçuşa kay
+        while sold[idx] >= flights[idx][7]:
+            idx = (idx + 1) % n_flights
+        flight = flights[idx]
+        seat_index = (offsets[idx] + sold[idx] * strides[idx]) % flight[7]
+        sold[idx] += 1
+
+        departure = datetime.strptime(flight[1], DATE_FMT)
+        # Aynı yolcu/uçuş için PK çakışmasın diye saniye ofseti
+        booked_at = departure - timedelta(days=rng.randrange(1, 120), seconds=n % 86400)
+        business = seat_index < BUSINESS_ROWS * len(SEAT_COLUMNS)
+        price = round(rng.uniform(2500, 9000) if business else rng.uniform(600, 3500), 2)
+        key = (flight[0], f"{10000000000 + pidx}", booked_at.strftime(DATE_FMT))
+        booking_rows.append(key + (_seat_label(seat_index), price, rng.choice((0, 1, 1, 1, 2, 2, 3))))
+        (business_rows if business else economy_rows).append(key)
+
+        if len(booking_rows) >= INSERT_BATCH:
+            _flush(conn, booking_rows, economy_rows, business_rows)
+    _flush(conn, booking_rows, economy_rows, business_rows)
+    conn.execute(
+        """
+        INSERT INTO FlightInventory (flightNo, capacity, bookedEconomy, bookedBusiness, held)
+        SELECT f.flightNo,
+               a.capacity,
+               (SELECT COUNT(*) FROM EconomyClass e WHERE e.EflightNo = f.flightNo),
+               (SELECT COUNT(*) FROM BusinessClass c WHERE c.BflightNo = f.flightNo),
+               0
+        FROM Flight f
+        JOIN Airplane a ON f.fregNo = a.regNo
+        """
+    )
+    conn.commit()
+
+    return {
+        "airplanes": n_planes,
+        "flights": n_flights,
+        "passengers": n_passengers,
+        "bookings": conn.execute("SELECT COUNT(*) FROM Booking").fetchone()[0],
+    }
+
+
+def _flush(conn, booking_rows, economy_rows, business_rows):
+    conn.executemany("INSERT OR IGNORE INTO Booking VALUES (?, ?, ?, ?, ?, ?)", booking_rows)
+    conn.executemany("INSERT OR IGNORE INTO EconomyClass VALUES (?, ?, ?)", economy_rows)
+    conn.executemany("INSERT OR IGNORE INTO BusinessClass VALUES (?, ?, ?)", business_rows)
+    booking_rows.clear()
+    economy_rows.clear()
+    business_rows.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SkyVoyage sentetik veri üreteci")
+    parser.add_argument("--bookings", type=int, default=10000, help="booking sayısı (10k - 10M)")
+    parser.add_argument("--out", default="skyvoyage_synthetic.db", help="SQLite dosya yolu")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--route-skew", type=float, default=1.1, help="Zipf üssü; büyüdükçe talep birkaç rotaya yığılır")
+    parser.add_argument("--load-factor", type=float, default=0.65, help="ortalama uçuş doluluk oranı")
+    args = parser.parse_args(argv)
+    if not 0 < args.load_factor < 1:
+        parser.error("--load-factor 0 ile 1 arasında olmalı")
+
+    started = time.perf_counter()
+    conn = connect(args.out)
+    try:
+        sizes = generate(conn, args.bookings, args.seed, args.route_skew, args.load_factor)
+    finally:
+        conn.close()
+    print(f"{args.out}: {sizes} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()